@@ -3,10 +3,16 @@
 
 __version__ = "0.1.1"
 
-from .protocol import Task, TaskStatus, TaskAction, RunResult
-from .queue import TaskQueue
-from .watcher import BridgeWatcher
+import functools
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .config import load_config
+from .protocol import Task, TaskStatus, TaskAction, RunResult
+from .queue import TaskQueue, open_queue
+
+if TYPE_CHECKING:
+    from .watcher import BridgeWatcher
 
 __all__ = [
     "Task",
@@ -18,6 +24,40 @@ __all__ = [
 ]
 
 
+def __getattr__(name: str) -> Any:
+    # The watcher pulls in the runners (subprocess, tempfile, …); load it
+    # only when asked for so short CLI commands don't pay for it.
+    if name == "BridgeWatcher":
+        from .watcher import BridgeWatcher
+        return BridgeWatcher
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _get_queue(
+    project_root: str | Path | None = None,
+    fail_on_error: bool = False,
+) -> TaskQueue:
+    """
+    Return the TaskQueue for a project root (cwd if omitted).
+
+    The config lookup is itself cached, so this costs a stat() plus a
+    dict lookup once a given bridge directory has been seen.
+    """
+    root = Path.cwd() if project_root is None else Path(project_root)
+    cfg = load_config(root, fail_on_error=fail_on_error)
+    bridge = cfg["bridge"]
+    bridge_dir = root / bridge["agent_bridge_dir"]
+    return _queue_for_bridge_dir(str(bridge_dir), bridge["backend"], bridge["fsync_every"])
+
+
+@functools.lru_cache(maxsize=8)
+def _queue_for_bridge_dir(bridge_dir: str, backend: str, fsync_every: int) -> TaskQueue:
+    return open_queue(bridge_dir, backend, fsync_every)
+
+
+_get_queue.cache_clear = _queue_for_bridge_dir.cache_clear  # type: ignore[attr-defined]
+
+
 def delegate_task(
     instructions: str,
     target_files: list[str] | None = None,
@@ -46,19 +86,7 @@ def delegate_task(
     Returns:
         The created Task object with its auto-generated ID.
     """
-    from pathlib import Path
-    from .config import load_config
-
-    if project_root is None:
-        project_root = str(Path.cwd())
-    else:
-        project_root = str(Path(project_root))
-
-    cfg = load_config(project_root)
-    bridge_dir = Path(project_root) / cfg.get("bridge", {}).get(
-        "agent_bridge_dir", ".agent_bridge"
-    )
-    queue = TaskQueue(bridge_dir)
+    queue = _get_queue(project_root)
     task = queue.create_task(
         instructions=instructions,
         agent=agent,
@@ -79,19 +107,7 @@ def retry_task(
     """
     Retry a failed task by creating a new PENDING task with updated instructions.
     """
-    from pathlib import Path
-    from .config import load_config
-
-    if project_root is None:
-        project_root = str(Path.cwd())
-    else:
-        project_root = str(Path(project_root))
-
-    cfg = load_config(project_root)
-    bridge_dir = Path(project_root) / cfg.get("bridge", {}).get(
-        "agent_bridge_dir", ".agent_bridge"
-    )
-    queue = TaskQueue(bridge_dir)
+    queue = _get_queue(project_root)
 
     orig = queue.get_task(task_id)
     if orig is None:
@@ -115,19 +131,7 @@ def retry_task(
 
 def check_status(task_id: str, project_root: str | Path | None = None) -> Task | None:
     """Check the current status of a delegated task."""
-    from pathlib import Path
-    from .config import load_config
-
-    if project_root is None:
-        project_root = str(Path.cwd())
-    else:
-        project_root = str(Path(project_root))
-
-    cfg = load_config(project_root)
-    bridge_dir = Path(project_root) / cfg.get("bridge", {}).get(
-        "agent_bridge_dir", ".agent_bridge"
-    )
-    queue = TaskQueue(bridge_dir)
+    queue = _get_queue(project_root)
     return queue.get_task(task_id)
 
 
@@ -136,17 +140,5 @@ def list_tasks(
     project_root: str | Path | None = None,
 ) -> list[Task]:
     """List all tasks, optionally filtered by status."""
-    from pathlib import Path
-    from .config import load_config
-
-    if project_root is None:
-        project_root = str(Path.cwd())
-    else:
-        project_root = str(Path(project_root))
-
-    cfg = load_config(project_root)
-    bridge_dir = Path(project_root) / cfg.get("bridge", {}).get(
-        "agent_bridge_dir", ".agent_bridge"
-    )
-    queue = TaskQueue(bridge_dir)
+    queue = _get_queue(project_root)
     return queue.list_tasks(status=status)
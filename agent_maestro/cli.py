@@ -14,9 +14,39 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import shutil
 import sys
 from pathlib import Path
+from typing import Callable, Optional
+
+from .protocol import TaskStatus
+
+_VALID_STATUSES: dict[str, TaskStatus] = {s.value: s for s in TaskStatus}
+_STATUS_VALUES: tuple[str, ...] = tuple(_VALID_STATUSES)
+
+# Row labels for `maestro stats`, printed in TaskStatus order
+_STATS_LABELS: dict[str, str] = {
+    "PENDING":   "   ⏳ Pending:   ",
+    "RUNNING":   "   🔄 Running:   ",
+    "COMPLETED": "   ✅ Completed: ",
+    "FAILED":    "   ❌ Failed:    ",
+}
+
+
+_INIT_NEXT_STEPS = (
+    "",
+    "🎵 Agent Maestro is ready!",
+    "   Next steps:",
+    "   1. Edit config.yaml with your Copilot CLI path",
+    "   2. Customize .github/agents/ for your workflow",
+    "   3. Run: maestro start",
+)
+
+
+def _emit(lines: list[str] | tuple[str, ...]) -> None:
+    """Write a block of output lines to stdout in a single call."""
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def _get_scaffold_dir() -> Path:
@@ -37,9 +67,14 @@ def cmd_init(args: argparse.Namespace) -> None:
     try:
         # 1. Create .agent_bridge directories
         bridge_dir = project_root / ".agent_bridge"
+        bridge_dir.mkdir(parents=True, exist_ok=True)
+        bridge_str = str(bridge_dir)
         for subdir in ("pending", "running", "completed", "failed"):
-            (bridge_dir / subdir).mkdir(parents=True, exist_ok=True)
-        print(f"  ✅ Created {bridge_dir.relative_to(project_root)}/")
+            try:
+                os.mkdir(os.path.join(bridge_str, subdir))
+            except FileExistsError:
+                pass
+        print(f"  ✅ Created {bridge_dir.name}/")
 
         # 2. Copy config.yaml (if it doesn't exist)
         config_dest = project_root / "config.yaml"
@@ -55,21 +90,21 @@ def cmd_init(args: argparse.Namespace) -> None:
         agents_src = scaffold_dir / "agents"
         agents_dest.mkdir(parents=True, exist_ok=True)
 
-        if agents_src.exists():
-            for agent_file in agents_src.glob("*.agent.md"):
-                dest_file = agents_dest / agent_file.name
+        if agents_src.is_dir():
+            # One directory read; shutil.copy2 already uses sendfile/fcopyfile
+            with os.scandir(agents_src) as it:
+                agent_names = sorted(
+                    e.name for e in it if e.name.endswith(".agent.md") and e.is_file()
+                )
+            for name in agent_names:
+                dest_file = agents_dest / name
                 if not dest_file.exists():
-                    shutil.copy2(agent_file, dest_file)
-                    print(f"  ✅ Created .github/agents/{agent_file.name}")
+                    shutil.copy2(agents_src / name, dest_file)
+                    print(f"  ✅ Created .github/agents/{name}")
                 else:
-                    print(f"  ⏭️  .github/agents/{agent_file.name} already exists — skipped")
-
-        print()
-        print("🎵 Agent Maestro is ready!")
-        print("   Next steps:")
-        print("   1. Edit config.yaml with your Copilot CLI path")
-        print("   2. Customize .github/agents/ for your workflow")
-        print("   3. Run: maestro start")
+                    print(f"  ⏭️  .github/agents/{name} already exists — skipped")
+
+        _emit(_INIT_NEXT_STEPS)
     except PermissionError as e:
         print(f"❌ Permission error while initializing {project_root}: {e}", file=sys.stderr)
         print("   Try running with elevated permissions or choose a writable directory.", file=sys.stderr)
@@ -83,7 +118,7 @@ def cmd_start(args: argparse.Namespace) -> None:
     """Start the watcher daemon."""
     from .watcher import main as watcher_main
     try:
-        watcher_main()
+        watcher_main(fail_on_error=True)
     except PermissionError as e:
         print(f"❌ Permission error starting watcher: {e}", file=sys.stderr)
         print("   Ensure the process can create files/sockets in the project directory.", file=sys.stderr)
@@ -107,14 +142,17 @@ def cmd_delegate(args: argparse.Namespace) -> None:
         project_root=args.project_root,
     )
 
-    print(f"📋 Task delegated: {task}")
-    print(f"   ID:         {task.id}")
-    print(f"   Action:     {task.action}")
+    lines = [
+        f"📋 Task delegated: {task}",
+        f"   ID:         {task.id}",
+        f"   Action:     {task.action}",
+    ]
     if task.agent_type:
-        print(f"   Agent:      @{task.agent_type}")
-    print(f"   Files:      {', '.join(task.target_files) or '(none)'}")
-    print()
-    print(f"   Track with: maestro status {task.id}")
+        lines.append(f"   Agent:      @{task.agent_type}")
+    lines.append(f"   Files:      {', '.join(task.target_files) or '(none)'}")
+    lines.append("")
+    lines.append(f"   Track with: maestro status {task.id}")
+    _emit(lines)
 
 
 def cmd_retry(args: argparse.Namespace) -> None:
@@ -134,13 +172,16 @@ def cmd_retry(args: argparse.Namespace) -> None:
         print(f"❌ {e}")
         sys.exit(1)
 
-    print(f"🔁 Task retried: {task}")
-    print(f"  New ID:      {task.id}")
+    lines = [
+        f"🔁 Task retried: {task}",
+        f"  New ID:      {task.id}",
+    ]
     if task.agent_type:
-        print(f"  Agent:       @{task.agent_type}")
-    print(f"  Files:       {', '.join(task.target_files) or '(none)'}")
-    print()
-    print(f"  Track with: maestro status {task.id}")
+        lines.append(f"  Agent:       @{task.agent_type}")
+    lines.append(f"  Files:       {', '.join(task.target_files) or '(none)'}")
+    lines.append("")
+    lines.append(f"  Track with: maestro status {task.id}")
+    _emit(lines)
 
 
 def cmd_status(args: argparse.Namespace) -> None:
@@ -152,155 +193,166 @@ def cmd_status(args: argparse.Namespace) -> None:
         print(f"❓ Task {args.task_id} not found")
         sys.exit(1)
 
-    print(f"Task: {task}")
-    print(f"  Status:      {task.status.value}")
+    lines = [
+        f"Task: {task}",
+        f"  Status:      {task.status.value}",
+    ]
     if task.agent_type:
-        print(f"  Agent type:  @{task.agent_type}")
-    print(f"  Created:     {task.created_at}")
+        lines.append(f"  Agent type:  @{task.agent_type}")
+    lines.append(f"  Created:     {task.created_at}")
     if task.completed_at:
-        print(f"  Completed:   {task.completed_at}")
+        lines.append(f"  Completed:   {task.completed_at}")
     if task.result:
-        print(f"  Result:      {str(task.result)[:200]}")
+        lines.append(f"  Result:      {str(task.result)[:200]}")
     if task.error:
-        print(f"  Error:       {task.error}")
+        lines.append(f"  Error:       {task.error}")
+    _emit(lines)
 
 
 def cmd_list(args: argparse.Namespace) -> None:
     """List all tasks."""
     from . import list_tasks
-    from .protocol import TaskStatus
-
-    status_filter = None
-    if args.status:
-        try:
-            status_filter = TaskStatus(args.status.upper())
-        except ValueError:
-            print(f"❌ Invalid status: {args.status}")
-            print(f"   Valid: {', '.join(s.value for s in TaskStatus)}")
-            sys.exit(1)
 
+    # argparse has already upper-cased and validated --status
+    status_filter = _VALID_STATUSES[args.status] if args.status else None
     tasks = list_tasks(status=status_filter, project_root=args.project_root)
 
     if not tasks:
         print("📭 No tasks found")
         return
 
-    for task in tasks:
-        print(f"  {task}")
+    _emit([f"  {task}" for task in tasks])
 
 
 def cmd_stats(args: argparse.Namespace) -> None:
     """Show task queue statistics."""
-    from .queue import TaskQueue
-    from .config import load_config
+    from . import _get_queue
 
-    project_root = args.project_root or "."
-    cfg = load_config(project_root)
-    bridge_dir = Path(project_root) / cfg.get("bridge", {}).get(
-        "agent_bridge_dir", ".agent_bridge"
-    )
-    queue = TaskQueue(bridge_dir)
+    queue = _get_queue(args.project_root or ".", fail_on_error=True)
     stats = queue.stats()
 
-    print("📊 Task Queue Statistics")
-    print(f"   ⏳ Pending:   {stats['PENDING']}")
-    print(f"   🔄 Running:   {stats['RUNNING']}")
-    print(f"   ✅ Completed: {stats['COMPLETED']}")
-    print(f"   ❌ Failed:    {stats['FAILED']}")
-    total = sum(stats.values())
-    print(f"   ── Total:     {total}")
+    lines = ["📊 Task Queue Statistics"]
+    lines.extend(f"{_STATS_LABELS[v]}{stats[v]}" for v in _STATUS_VALUES)
+    lines.append(f"   ── Total:     {sum(stats.values())}")
+    _emit(lines)
 
 
-def main() -> None:
-    """Main CLI entry point."""
-    parser = argparse.ArgumentParser(
-        prog="maestro",
-        description="🎼 Agent Maestro — Multi-agent task orchestration",
-    )
-    parser.add_argument(
-        "--project-root", "-p",
-        default=".",
-        help="Project root directory (default: current dir)",
-    )
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+# ── Subcommand table ─────────────────────────────────────────────────
 
-    # ── init ──────────────────────────────────────────────────────────
-    init_parser = subparsers.add_parser(
-        "init", help="Scaffold config + dirs + custom agents"
-    )
-    init_parser.set_defaults(func=cmd_init)
-
-    # ── start ─────────────────────────────────────────────────────────
-    start_parser = subparsers.add_parser(
-        "start", help="Start the watcher daemon"
-    )
-    start_parser.set_defaults(func=cmd_start)
-
-    # ── delegate ──────────────────────────────────────────────────────
-    delegate_parser = subparsers.add_parser(
-        "delegate", help="Delegate a task to a sub-agent"
-    )
-    delegate_parser.add_argument(
+def _add_delegate_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
         "instructions", help="What the sub-agent should do"
     )
-    delegate_parser.add_argument(
+    p.add_argument(
         "--files", "-f", nargs="*", default=[],
         help="Target files for the agent to focus on"
     )
-    delegate_parser.add_argument(
+    p.add_argument(
         "--action", "-a", default="implement",
         help="Task type: implement, test, refactor, fix, review (default: implement)"
     )
-    delegate_parser.add_argument(
+    p.add_argument(
         "--agent-type", "-t", default="",
         help="Custom agent to route to: tester, reviewer (empty = default agent)"
     )
-    delegate_parser.add_argument(
+    p.add_argument(
         "--context", "-c", default="",
         help="Extra context for the agent"
     )
-    delegate_parser.add_argument(
+    p.add_argument(
         "--priority", type=int, default=0,
         help="Priority (0=normal, higher=more urgent)"
     )
-    delegate_parser.set_defaults(func=cmd_delegate)
 
-    # ── retry ─────────────────────────────────────────────────────────
-    retry_parser = subparsers.add_parser(
-        "retry", help="Retry a failed task with updated instructions"
-    )
-    retry_parser.add_argument("task_id", help="ID of the failed task to retry")
-    retry_parser.add_argument(
+
+def _add_retry_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("task_id", help="ID of the failed task to retry")
+    p.add_argument(
         "--instructions", "-i", required=True,
         help="New instructions for the retried task"
     )
-    retry_parser.set_defaults(func=cmd_retry)
 
-    # ── status────────────────────────────────────────────────────────
-    status_parser = subparsers.add_parser(
-        "status", help="Check task status"
-    )
-    status_parser.add_argument("task_id", help="Task ID to check")
-    status_parser.set_defaults(func=cmd_status)
 
-    # ── list ──────────────────────────────────────────────────────────
-    list_parser = subparsers.add_parser(
-        "list", help="List all tasks"
-    )
-    list_parser.add_argument(
+def _add_status_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("task_id", help="Task ID to check")
+
+
+def _add_list_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
         "--status", "-s", default=None,
+        type=str.upper, choices=_STATUS_VALUES, metavar="STATUS",
         help="Filter by status: PENDING, RUNNING, COMPLETED, FAILED"
     )
-    list_parser.set_defaults(func=cmd_list)
 
-    # ── stats ─────────────────────────────────────────────────────────
-    stats_parser = subparsers.add_parser(
-        "stats", help="Show task queue statistics"
+
+_Handler = Callable[[argparse.Namespace], None]
+_ArgRegistrar = Optional[Callable[[argparse.ArgumentParser], None]]
+
+# name -> (help, handler, argument registrar)
+_COMMANDS: dict[str, tuple[str, _Handler, _ArgRegistrar]] = {
+    "init":     ("Scaffold config + dirs + custom agents", cmd_init, None),
+    "start":    ("Start the watcher daemon", cmd_start, None),
+    "delegate": ("Delegate a task to a sub-agent", cmd_delegate, _add_delegate_args),
+    "retry":    ("Retry a failed task with updated instructions", cmd_retry, _add_retry_args),
+    "status":   ("Check task status", cmd_status, _add_status_args),
+    "list":     ("List all tasks", cmd_list, _add_list_args),
+    "stats":    ("Show task queue statistics", cmd_stats, None),
+}
+
+
+def _find_command(argv: list[str]) -> Optional[str]:
+    """
+    Return the subcommand token in argv, or None if there isn't one or
+    top-level help was requested before it.
+    """
+    tokens = iter(argv)
+    for tok in tokens:
+        if tok in ("-h", "--help"):
+            return None
+        if tok in ("--project-root", "-p"):
+            next(tokens, None)
+            continue
+        if tok.startswith("-"):
+            continue
+        return tok
+    return None
+
+
+def _build_parser(only: Optional[str] = None) -> argparse.ArgumentParser:
+    """
+    Build the argument parser. If `only` names a known command, just that
+    subparser is registered; otherwise all of them are (help, errors).
+    """
+    parser = argparse.ArgumentParser(
+        prog="maestro",
+        description="🎼 Agent Maestro — Multi-agent task orchestration",
+    )
+    parser.add_argument(
+        "--project-root", "-p",
+        default=".",
+        help="Project root directory (default: current dir)",
     )
-    stats_parser.set_defaults(func=cmd_stats)
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    for name, (help_text, func, add_args) in _COMMANDS.items():
+        if only is not None and name != only:
+            continue
+        sub = subparsers.add_parser(name, help=help_text)
+        if add_args is not None:
+            add_args(sub)
+        sub.set_defaults(func=func)
+
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Main CLI entry point."""
+    if argv is None:
+        argv = sys.argv[1:]
 
-    # ── Parse and dispatch ────────────────────────────────────────────
-    args = parser.parse_args()
+    command = _find_command(argv)
+    parser = _build_parser(command if command in _COMMANDS else None)
+    args = parser.parse_args(argv)
 
     if args.command is None:
         parser.print_help()
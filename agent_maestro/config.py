@@ -6,44 +6,63 @@ Looks for `config.yaml` in the project root.
 
 from __future__ import annotations
 
+import copy
+import os
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any
 
 
-def load_config(project_root: str | Path | None = None, fail_on_error: Optional[bool] = None) -> dict[str, Any]:
+# Parsed configs keyed by absolute config.yaml path. Each entry stores the
+# (st_mtime_ns, st_size) the file had when parsed, so edits invalidate it.
+_CONFIG_CACHE: dict[Path, tuple[int, int, dict[str, Any]]] = {}
+
+
+def load_config(project_root: str | Path | None = None, fail_on_error: bool = False) -> dict[str, Any]:
     """
     Load configuration from config.yaml in the project root.
 
+    Parsed results are cached per process and reused until the file's
+    mtime or size changes. Callers always receive their own copy.
+
     Args:
-        project_root: Path to the project root. Defaults to cwd.
+        project_root:  Path to the project root. Defaults to cwd.
+        fail_on_error: Exit with status 2 on invalid config (CLI callers)
+                       instead of warning / raising ValueError.
 
     Returns:
         Merged configuration dict.
     """
     import yaml
     import sys
-    import inspect
 
-    if fail_on_error is None:
-        fail_on_error = any(
-            "agent_maestro\\cli.py" in (frame.filename or "")
-            for frame in inspect.stack()
-        )
+    try:
+        from yaml import CSafeLoader as _Loader
+    except ImportError:  # PyYAML built without LibYAML
+        from yaml import SafeLoader as _Loader
 
     if project_root is None:
         project_root = Path.cwd()
     else:
         project_root = Path(project_root)
 
-    config_path = project_root / "config.yaml"
+    # absolute() rather than resolve(): the cache key only has to be stable
+    # across chdir, and skipping realpath saves an lstat per path component.
+    config_path = (project_root / "config.yaml").absolute()
 
-    if not config_path.exists():
+    try:
+        st = os.stat(config_path)
+    except FileNotFoundError:
+        # A fresh literal is cheaper than deep-copying a frozen template.
         return _defaults()
 
+    cached = _CONFIG_CACHE.get(config_path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return copy.deepcopy(cached[2])
+
     try:
         with open(config_path, "r", encoding="utf-8") as f:
             try:
-                user_config = yaml.safe_load(f) or {}
+                user_config = yaml.load(f, Loader=_Loader) or {}
             except yaml.YAMLError as e:
                 msg = f"Failed to parse config.yaml: {e}"
                 # decide whether to fail or fallback based on caller context
@@ -64,7 +83,8 @@ def load_config(project_root: str | Path | None = None, fail_on_error: Optional[
 
     # Merge user config onto defaults
     defaults = _defaults()
-    _deep_merge(defaults, user_config)
+    if user_config:
+        _deep_merge(defaults, user_config)
 
     # Normalize runners default key (allow hyphen/underscore mismatch)
     runners = defaults.get("runners", {})
@@ -96,7 +116,7 @@ def load_config(project_root: str | Path | None = None, fail_on_error: Optional[
         # non-CLI callers get an exception
         raise ValueError(msg)
 
-    for key in ("poll_interval_seconds", "max_concurrent_tasks"):
+    for key in ("poll_interval_seconds", "max_concurrent_tasks", "fsync_every"):
         val = bridge.get(key)
         if isinstance(val, str):
             if val.isdigit():
@@ -110,9 +130,19 @@ def load_config(project_root: str | Path | None = None, fail_on_error: Optional[
                 f"Invalid type for bridge.{key}: expected int, got {type(val).__name__}"
             )
 
+    if bridge.get("backend") not in ("files", "sqlite"):
+        _handle_error(
+            f"Invalid value for bridge.backend: expected 'files' or 'sqlite', "
+            f"got {bridge.get('backend')!r}"
+        )
+
+    _CONFIG_CACHE[config_path] = (st.st_mtime_ns, st.st_size, copy.deepcopy(defaults))
     return defaults
 
 
+load_config.cache_clear = _CONFIG_CACHE.clear  # type: ignore[attr-defined]
+
+
 def _defaults() -> dict[str, Any]:
     """Return the default configuration."""
     return {
@@ -121,6 +151,8 @@ def _defaults() -> dict[str, Any]:
             "max_concurrent_tasks": 1,
             "task_timeout_seconds": 300,
             "agent_bridge_dir": ".agent_bridge",
+            "backend": "files",
+            "fsync_every": 1,
         },
         "runners": {
             "default": "copilot-cli",
@@ -139,9 +171,12 @@ def _defaults() -> dict[str, Any]:
 
 
 def _deep_merge(base: dict, override: dict) -> None:
-    """Recursively merge `override` into `base` in place."""
-    for key, value in override.items():
-        if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-            _deep_merge(base[key], value)
-        else:
-            base[key] = value
+    """Merge `override` into `base` in place, descending into nested dicts."""
+    stack = [(base, override)]
+    while stack:
+        b, o = stack.pop()
+        for key, value in o.items():
+            if isinstance(value, dict) and isinstance(b.get(key), dict):
+                stack.append((b[key], value))
+            else:
+                b[key] = value
@@ -16,15 +16,304 @@ Assumptions and edge cases:
 
 from __future__ import annotations
 
+import errno
+import functools
+import itertools
 import json
 import os
-import tempfile
-import uuid
-from dataclasses import dataclass, field, asdict
-from datetime import datetime, timezone
+import sys
+import time
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional
+
+try:
+    import orjson
+except ImportError:  # optional speed-up: pip install agent-maestro[fast]
+    orjson = None
+
+
+# json.dumps() builds a new JSONEncoder whenever it gets non-default
+# options; the stdlib fallback reuses this one instead.
+_json_encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+
+def _dumps(obj: dict) -> bytes:
+    """Encode to indented UTF-8 JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return _json_encoder.encode(obj).encode("utf-8")
+
+
+_compact_encoder = json.JSONEncoder(ensure_ascii=False)
+
+
+def _dumps_compact(obj: dict) -> str:
+    """Encode to a compact JSON string (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return _compact_encoder.encode(obj)
+
+
+# Without orjson, Task files are formatted by hand: json's indent mode runs
+# its pure-Python encoder, whereas the fixed, flat Task schema only needs
+# the C string escaper. Long free-text fields (instructions, context) are
+# rewritten unchanged on every status transition, so their escaped form
+# is cached.
+_escape = json.encoder.encode_basestring
+_escape_cached = functools.lru_cache(maxsize=32)(_escape)
+_ESCAPE_CACHE_MIN_LEN = 256
+
+
+def _format_task_json(data: dict) -> Optional[str]:
+    """
+    Format a Task dict exactly like json.dumps(indent=2, ensure_ascii=False).
+    Returns None if a value isn't a str, int, None or list of str, so the
+    caller can fall back to the generic encoder.
+    """
+    lines = []
+    for key, value in data.items():
+        cls = value.__class__
+        if cls is str:
+            text = _escape_cached(value) if len(value) >= _ESCAPE_CACHE_MIN_LEN else _escape(value)
+        elif value is None:
+            text = "null"
+        elif cls is int:
+            text = int.__repr__(value)
+        elif cls is list and all(item.__class__ is str for item in value):
+            text = "[\n    " + ",\n    ".join(map(_escape, value)) + "\n  ]" if value else "[]"
+        else:
+            return None
+        lines.append(f"  {_escape(key)}: {text}")
+    return "{\n" + ",\n".join(lines) + "\n}"
+
+
+def _loads(data: bytes | str):
+    """Decode JSON. orjson's errors subclass json.JSONDecodeError."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Temp-file names only need to be unique among concurrent writers of one
+# directory: pid + a per-process counter covers that (O_EXCL backs it up)
+# without tempfile's random-name retry loop and finalizer.
+_tmp_counter = itertools.count()
+_O_TMP = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+
+def _write_temp(path: Path | str, data: bytes, tag: str = "", durable: bool = True) -> str:
+    """
+    Write `data` to a fresh temp file next to `path` (fsynced where
+    supported, unless durable=False) and return the temp file's path.
+    The caller publishes it with os.replace or removes it.
+
+    Paths are handled as strings: this runs on every queue write.
+    """
+    tmp, fd = _open_temp(path, tag)
+    try:
+        try:
+            _write_all(fd, data)
+            if durable:
+                _fsync_quietly(fd)
+        finally:
+            os.close(fd)
+    except BaseException:
+        _unlink_quietly(tmp)
+        raise
+    return tmp
+
+
+def _write_temps(items: list[tuple[str, bytes, str]]) -> list[str]:
+    """
+    _write_temp for a batch of (path, data, tag), returning the temp paths
+    in order. Every file is written before any is fsynced, so the
+    filesystem can flush them together (on ext4, one journal commit rather
+    than one per file). On error no temp file is left behind.
+    """
+    tmps: list[str] = []
+    fds: list[int] = []
+    try:
+        try:
+            for path, data, tag in items:
+                tmp, fd = _open_temp(path, tag)
+                tmps.append(tmp)
+                fds.append(fd)
+                _write_all(fd, data)
+            for fd in fds:
+                _fsync_quietly(fd)
+        finally:
+            for fd in fds:
+                os.close(fd)
+    except BaseException:
+        for tmp in tmps:
+            _unlink_quietly(tmp)
+        raise
+    return tmps
+
+
+def _open_temp(path: Path | str, tag: str) -> tuple[str, int]:
+    """Create a fresh temp file next to `path`: (its path, a write-only fd)."""
+    parent = os.path.dirname(os.fspath(path))
+    tmp = os.path.join(parent, f".task_{tag}.{os.getpid()}.{next(_tmp_counter)}.tmp")
+    try:
+        fd = os.open(tmp, _O_TMP, 0o600)
+    except FileNotFoundError:
+        # Parent missing: create it only now, keeping mkdir off the hot path
+        os.makedirs(parent or os.curdir, exist_ok=True)
+        fd = os.open(tmp, _O_TMP, 0o600)
+    return tmp, fd
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _fsync_quietly(fd: int) -> None:
+    try:
+        os.fsync(fd)
+    except OSError:
+        # fsync may not be available on some platforms/filesystems
+        pass
+
+
+_O_READ = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+
+def _read_bytes(path: Path | str, size: int = -1) -> bytes:
+    """
+    Read a whole (small) file with raw os.read calls.
+
+    `size` is the expected length, typically from a stat the caller has
+    already done; if unknown it is taken from fstat. One read of size+1
+    bytes then normally returns everything, and reaching EOF is detected
+    from the short count, without Path.read_bytes' buffered-IO layer and
+    extra read. (mmap + parsing the mapping in place was measured slower
+    for anything under ~1 MiB; task files are a few KiB.)
+    """
+    fd = os.open(path, _O_READ)
+    try:
+        if size < 0:
+            size = os.fstat(fd).st_size
+        data = os.read(fd, size + 1)
+        if len(data) <= size:
+            return data
+        # File grew since the stat; read on to EOF
+        chunks = [data]
+        while chunk := os.read(fd, 65536):
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _unlink_quietly(path: Path | str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+_AT_FDCWD = -100
+_RENAME_NOREPLACE = 1
+
+
+@functools.cache
+def _renameat2():
+    """libc's renameat2, or None where it isn't available (non-Linux, old glibc)."""
+    if not sys.platform.startswith("linux"):
+        return None
+    import ctypes  # only needed by exclusive writes; keep it off import time
+
+    try:
+        fn = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint)
+    return fn
+
+
+def _rename_noreplace(src: str, dst: str) -> None:
+    """
+    Rename src to dst atomically, raising FileExistsError instead of
+    replacing an existing dst.
+    """
+    renameat2 = _renameat2()
+    if renameat2 is not None:
+        if renameat2(_AT_FDCWD, os.fsencode(src), _AT_FDCWD, os.fsencode(dst), _RENAME_NOREPLACE) == 0:
+            return
+        import ctypes
+
+        err = ctypes.get_errno()
+        if err not in (errno.EINVAL, errno.ENOSYS):
+            raise OSError(err, os.strerror(err), src, None, dst)
+        # Kernel or filesystem without RENAME_NOREPLACE: fall through
+    if os.name == "nt":
+        os.rename(src, dst)  # never replaces on Windows
+        return
+    # Elsewhere check-then-replace: the clash check is best effort, but
+    # the move itself stays a single atomic rename (link + unlink would
+    # briefly leave the file in both places)
+    if os.path.lexists(dst):
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dst)
+    os.replace(src, dst)
+
+
+def _atomic_write(
+    path: Path | str,
+    data: bytes,
+    tag: str = "",
+    durable: bool = True,
+    exclusive: bool = False,
+) -> None:
+    """
+    Publish `data` at `path` atomically: write a sibling temp file, then
+    os.replace it over the target. Readers see either the old file or the
+    complete new one, never a partial write.
+
+    durable=False skips the fsync: the replace is still atomic, but the
+    new contents may be lost (old file kept) if the machine crashes.
+    exclusive=True raises FileExistsError instead of replacing an existing
+    file at `path`.
+    """
+    tmp = _write_temp(path, data, tag, durable)
+    try:
+        if exclusive:
+            _rename_noreplace(tmp, os.fspath(path))
+        else:
+            os.replace(tmp, path)
+    except BaseException:
+        _unlink_quietly(tmp)
+        raise
+
+
+def _new_task_id() -> str:
+    # 8 random hex chars, same shape as uuid4().hex[:8] without the UUID object
+    return os.urandom(4).hex()
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") for the last second formatted
+_now_cache: tuple[Optional[int], str] = (None, "")
+
+
+def _utc_now() -> str:
+    """
+    Same string as datetime.now(timezone.utc).isoformat(), but only the
+    date/time prefix is formatted, once per second. Microseconds are kept
+    so tasks created in a burst still sort in creation order.
+    """
+    global _now_cache
+    sec, us = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_sec, prefix = _now_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _now_cache = (sec, prefix)
+    if us:
+        return f"{prefix}.{us:06d}+00:00"
+    return prefix + "+00:00"  # isoformat() omits a zero fraction
 
 
 class TaskStatus(str, Enum):
@@ -35,6 +324,32 @@ class TaskStatus(str, Enum):
     FAILED = "FAILED"
 
 
+# Value -> member, so deserialization avoids EnumMeta.__call__
+_STATUS_BY_VALUE: dict[str, TaskStatus] = {s.value: s for s in TaskStatus}
+
+
+def _parse_status(raw) -> TaskStatus:
+    if isinstance(raw, TaskStatus):
+        return raw
+    status = _STATUS_BY_VALUE.get(raw)
+    if status is None:
+        raise ValueError(f"{raw!r} is not a valid TaskStatus")
+    return status
+
+
+# Built once: a {TaskStatus.X, ...} literal would look both members up
+# through EnumType on every call
+_TERMINAL_STATUSES = frozenset({TaskStatus.COMPLETED, TaskStatus.FAILED})
+
+# Used by Task.__str__, which runs on every task log line
+_STATUS_ICONS: dict[TaskStatus, str] = {
+    TaskStatus.PENDING: "⏳",
+    TaskStatus.RUNNING: "🔄",
+    TaskStatus.COMPLETED: "✅",
+    TaskStatus.FAILED: "❌",
+}
+
+
 class TaskAction(str, Enum):
     """Well-known action types the orchestrator can request."""
     IMPLEMENT = "implement"
@@ -46,7 +361,7 @@ class TaskAction(str, Enum):
     CUSTOM = "custom"
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """
     A single unit of work delegated from the orchestrator to a sub-agent.
@@ -76,77 +391,102 @@ class Task:
     context: str = ""
     result: Optional[str] = None
     error: Optional[str] = None
-    id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
-    created_at: str = field(
-        default_factory=lambda: datetime.now(timezone.utc).isoformat()
-    )
+    id: str = field(default_factory=_new_task_id)
+    created_at: str = field(default_factory=_utc_now)
     completed_at: Optional[str] = None
     priority: int = 0
 
+    def __post_init__(self) -> None:
+        # Coerce once here so status is always a TaskStatus afterwards
+        self.status = _parse_status(self.status)
+
     # ── Serialization ────────────────────────────────────────────────
 
     def to_dict(self) -> dict:
-        """Serialize to a JSON-friendly dict."""
-        data = asdict(self)
-        data["status"] = self.status.value if isinstance(self.status, TaskStatus) else self.status
-        return data
+        """Serialize to a JSON-friendly dict (fields in declaration order).
+
+        Built by hand rather than with dataclasses.asdict, which deep-copies
+        every field; target_files is the only mutable one and gets a copy.
+        """
+        return {
+            "instructions": self.instructions,
+            "agent": self.agent,
+            "agent_type": self.agent_type,
+            "action": self.action,
+            "target_files": list(self.target_files),
+            "status": self.status.value,
+            "context": self.context,
+            "result": self.result,
+            "error": self.error,
+            "id": self.id,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+            "priority": self.priority,
+        }
 
     def to_json(self, indent: int = 2) -> str:
         """Serialize to a JSON string."""
+        if indent == 2:
+            return self.to_bytes().decode("utf-8")
         return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
 
+    def to_bytes(self) -> bytes:
+        """Serialize to the UTF-8 JSON bytes written by save()."""
+        data = self.to_dict()
+        if orjson is None:
+            text = _format_task_json(data)
+            if text is not None:
+                return text.encode("utf-8")
+        return _dumps(data)
+
     @classmethod
     def from_dict(cls, data: dict) -> Task:
-        """Deserialize from a dict."""
-        data = data.copy()
-        raw_status = data.get("status", "PENDING")
-        data["status"] = TaskStatus(raw_status) if isinstance(raw_status, str) else raw_status
-        # Handle legacy tasks without agent_type
-        if "agent_type" not in data:
-            data["agent_type"] = ""
-        return cls(**data)
+        """Deserialize from a dict. Keys that aren't Task fields are ignored.
+
+        Reads each field directly, with the same defaults as the dataclass
+        (legacy files may lack e.g. agent_type), instead of filtering the
+        dict and unpacking it into cls(**data).
+        """
+        get = data.get
+        return cls(
+            instructions=data["instructions"],
+            agent=get("agent", "gpt-5-mini"),
+            agent_type=get("agent_type", ""),
+            action=get("action", TaskAction.IMPLEMENT.value),
+            target_files=list(get("target_files") or ()),
+            status=get("status", "PENDING"),
+            context=get("context", ""),
+            result=get("result"),
+            error=get("error"),
+            id=data["id"] if "id" in data else _new_task_id(),
+            created_at=data["created_at"] if "created_at" in data else _utc_now(),
+            completed_at=get("completed_at"),
+            priority=get("priority", 0),
+        )
 
     @classmethod
     def from_json(cls, text: str) -> Task:
-        """Deserialize from a JSON string."""
-        return cls.from_dict(json.loads(text))
+        """Deserialize from a JSON string (or UTF-8 bytes)."""
+        return cls.from_dict(_loads(text))
 
     @classmethod
-    def from_file(cls, path: Path | str) -> Task:
-        """Load a task from a JSON file."""
-        return cls.from_json(Path(path).read_text(encoding="utf-8"))
+    def from_file(cls, path: Path | str, size_hint: int = -1) -> Task:
+        """Load a task from a JSON file.
+
+        size_hint is the file size if the caller already knows it (e.g.
+        from a DirEntry stat); it only saves an fstat.
+        """
+        return cls.from_dict(_loads(_read_bytes(path, size_hint)))
 
-    def save(self, path: Path | str) -> None:
+    def save(self, path: Path | str, *, durable: bool = True, exclusive: bool = False) -> None:
         """Save the task to a JSON file atomically.
 
-        Writes to a temporary file in the same directory, fsyncs if possible,
-        and then atomically replaces the target file using os.replace.
+        Writes to a temporary file in the same directory, fsyncs if possible
+        (unless durable=False), and then atomically replaces the target file
+        using os.replace. With exclusive=True an existing file is never
+        replaced; FileExistsError is raised instead.
         """
-        path = Path(path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        text = self.to_json()
-        tmp = None
-        try:
-            # Create unpredictable temporary file in the same directory
-            # and write data ensuring it is flushed and fsynced.
-            with tempfile.NamedTemporaryFile(delete=False, dir=path.parent, prefix=".task_", suffix=".tmp", mode="w", encoding="utf-8") as tf:
-                tmp = Path(tf.name)
-                tf.write(text)
-                tf.flush()
-                try:
-                    os.fsync(tf.fileno())
-                except (AttributeError, OSError):
-                    # fsync may not be available on some platforms/filesystems
-                    pass
-            # Atomically replace the final file
-            os.replace(str(tmp), str(path))
-        finally:
-            # Clean up leftover tmp if it still exists
-            try:
-                if tmp is not None and tmp.exists():
-                    tmp.unlink()
-            except Exception:
-                pass
+        _atomic_write(path, self.to_bytes(), self.id, durable, exclusive)
 
     # ── Lifecycle helpers ────────────────────────────────────────────
 
@@ -156,15 +496,15 @@ class Task:
     def mark_completed(self, result: str) -> None:
         self.status = TaskStatus.COMPLETED
         self.result = result
-        self.completed_at = datetime.now(timezone.utc).isoformat()
+        self.completed_at = _utc_now()
 
     def mark_failed(self, error: str) -> None:
         self.status = TaskStatus.FAILED
         self.error = error
-        self.completed_at = datetime.now(timezone.utc).isoformat()
+        self.completed_at = _utc_now()
 
     def is_terminal(self) -> bool:
-        return self.status in {TaskStatus.COMPLETED, TaskStatus.FAILED}
+        return self.status in _TERMINAL_STATUSES
 
     @property
     def filename(self) -> str:
@@ -172,18 +512,40 @@ class Task:
         return f"task_{self.id}.json"
 
     def __str__(self) -> str:
-        status_icon = {
-            TaskStatus.PENDING: "⏳",
-            TaskStatus.RUNNING: "🔄",
-            TaskStatus.COMPLETED: "✅",
-            TaskStatus.FAILED: "❌",
-        }
-        icon = status_icon.get(self.status, "❓")
+        icon = _STATUS_ICONS.get(self.status, "❓")
         agent_tag = f" @{self.agent_type}" if self.agent_type else ""
         return f"{icon} [{self.id}] {self.action}{agent_tag}: {self.instructions[:60]}…"
 
 
-@dataclass
+def _new_task(
+    instructions: str,
+    agent: str = "gpt-5-mini",
+    action: str = "implement",
+    target_files: Optional[list[str]] = None,
+    context: str = "",
+    priority: int = 0,
+    agent_type: str = "",
+) -> Task:
+    """Build a new PENDING task; both queue backends' create paths use this."""
+    return Task(
+        instructions=instructions,
+        agent=agent,
+        action=action,
+        target_files=target_files or [],
+        context=context,
+        priority=priority,
+        agent_type=agent_type,
+    )
+
+
+class TaskHeader(NamedTuple):
+    """The fields needed to pick the next task, without building a Task."""
+    id: str
+    priority: int
+    created_at: str
+
+
+@dataclass(slots=True)
 class RunResult:
     """Result returned by a runner after executing a task."""
     success: bool
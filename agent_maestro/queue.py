@@ -14,24 +14,64 @@ Moving a task between directories is the atomic status transition.
 
 Assumptions and edge cases:
 - Claiming a task is implemented as an atomic filesystem rename from
-  pending/ -> running/ using os.replace. If the source is missing at
-  replace time it is treated as already-claimed by another process.
+  pending/ -> running/; no lock or marker file is involved. If the
+  source is missing at rename time it is treated as already-claimed by
+  another process. The rename never replaces a file already in
+  running/ (renameat2 RENAME_NOREPLACE on Linux, rename on Windows);
+  elsewhere that clash check is best effort, but two claimers still
+  can't both win, since only one of them finds the source.
 - _move_task uses os.replace to perform atomic moves and reports an
   explicit FileNotFoundError when the source is gone.
 - list_tasks will quarantine malformed JSON files into a quarantine/
   directory instead of silently skipping them.
+- get_pending_tasks keeps an index of already-parsed pending files keyed
+  by filename. Pending files are written once and then only ever moved
+  out, so a name seen before needs no re-read; each call still scans
+  pending/ so tasks created by other processes are picked up. Entries
+  are checked against the inode from the listing (no extra syscall on
+  POSIX), so a file replaced in place by another tool is re-read.
+  get_pending_headers reads the same index but returns only TaskHeader
+  tuples, for callers (the watcher) that just need to pick the next id.
+- list_tasks caches parsed files per status dir, validated by
+  (st_ino, st_mtime_ns, st_size). Every rewrite goes through os.replace
+  and so produces a new inode, which makes a stale hit very unlikely.
+  get_task (and complete/fail) use the same cache with the stat their
+  lookup already makes. A move by this queue drops the entry for the
+  old location; files moved away by other processes are pruned by the
+  next scan of that dir, or by clear_*.
+- Task lookups (_locate) first try the status this process last saw a task
+  in (create/claim/move record it), so the common lookup is one stat.
+  The hint is always verified; if another process moved the task the
+  other status dirs are probed as before. Only live (PENDING / RUNNING)
+  tasks are hinted: reaching COMPLETED or FAILED drops the hint, so the
+  map stays as small as the live queue.
+- Every write is atomic, but only creation and terminal (COMPLETED /
+  FAILED) writes are always fsynced. The RUNNING rewrite done by
+  claim_task is fsynced every `fsync_every` claims (1 = always, 0 =
+  never); losing it in a crash leaves a RUNNING task whose file still
+  says PENDING, which is already the state a crashed watcher leaves.
+- Directories are not fsynced per operation: flush() fsyncs the status
+  dirs changed since the last flush, making the renames durable too.
+  The watcher flushes when it stops.
 """
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import json
 import os
 import shutil
 import logging
+import threading
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterable, Iterator, Optional
 
-from .protocol import Task, TaskStatus
+from .protocol import (
+    Task, TaskHeader, TaskStatus, _TERMINAL_STATUSES, _new_task, _new_task_id, _rename_noreplace,
+    _unlink_quietly, _write_temp, _write_temps,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +84,18 @@ _STATUS_DIRS: dict[TaskStatus, str] = {
     TaskStatus.FAILED: "failed",
 }
 
+# Iterating an Enum goes through EnumMeta.__iter__ each time; a tuple doesn't
+_ALL_STATUSES: tuple[TaskStatus, ...] = tuple(TaskStatus)
+# Likewise TaskStatus.X is a ~100ns EnumType lookup; the per-task paths
+# (create, claim, complete, pending scan) use these plain globals instead
+_PENDING = TaskStatus.PENDING
+_RUNNING = TaskStatus.RUNNING
+
+# Tasks written per fsync batch by create_tasks (each holds an fd meanwhile)
+_CREATE_BATCH = 256
+
+_O_DIRECTORY = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)
+
 
 class TaskQueue:
     """
@@ -56,19 +108,79 @@ class TaskQueue:
         queue.complete_task(task.id, "Done — 12 tests added.")
     """
 
-    def __init__(self, root: Path | str):
+    def __init__(self, root: Path | str, fsync_every: int = 1):
         self.root = Path(root)
+        self._dirs: dict[TaskStatus, Path] = {
+            s: self.root / d for s, d in _STATUS_DIRS.items()
+        }
+        # Same dirs as strings ending in a separator: task paths on the hot
+        # paths are built by concatenation rather than Path arithmetic
+        self._prefixes: dict[TaskStatus, str] = {
+            s: os.path.join(p, "") for s, p in self._dirs.items()
+        }
+        self._prefix_items: tuple[tuple[TaskStatus, str], ...] = tuple(self._prefixes.items())
+        self._status_by_prefix: dict[str, TaskStatus] = {p: s for s, p in self._prefix_items}
+        self._fsync_every = fsync_every
+        self._interior_writes = itertools.count(1)
+        # pending filename -> (sort key, task dict, inode); see get_pending_tasks
+        self._pending_index: dict[str, tuple[tuple[int, str], dict, int]] = {}
+        self._pending_lock = threading.Lock()
+        # status -> filename -> (stat key, task dict); see list_tasks
+        self._parse_cache: dict[TaskStatus, dict[str, tuple[tuple[int, int, int], dict]]] = {
+            s: {} for s in TaskStatus
+        }
+        self._parse_locks = {s: threading.Lock() for s in TaskStatus}
+        # task id -> status dir it was last seen in; see _locate
+        self._locations: dict[str, TaskStatus] = {}
+        # Dir prefixes whose entries changed since the last flush()
+        self._dirty: set[str] = set()
         self._ensure_dirs()
 
     # ── Directory management ─────────────────────────────────────────
 
     def _ensure_dirs(self) -> None:
-        """Create subdirectories if they don't exist."""
-        for subdir in _STATUS_DIRS.values():
-            (self.root / subdir).mkdir(parents=True, exist_ok=True)
+        """
+        Create subdirectories if they don't exist. One listing of the root
+        finds those already there, instead of a failing mkdir plus an
+        is-it-a-directory stat per status dir on every construction.
+        """
+        try:
+            with os.scandir(self.root) as it:
+                present = {entry.name for entry in it if entry.is_dir()}
+        except FileNotFoundError:
+            present = set()
+        for status, path in self._dirs.items():
+            if _STATUS_DIRS[status] not in present:
+                path.mkdir(parents=True, exist_ok=True)
 
     def _dir_for(self, status: TaskStatus) -> Path:
-        return self.root / _STATUS_DIRS[status]
+        return self._dirs[status]
+
+    def _task_entries(self, status: TaskStatus) -> Iterator[os.DirEntry]:
+        """
+        Yield task_*.json files of a status dir (none if it's missing).
+        is_file() is answered from the listing's d_type where available,
+        so filtering out stray directories costs no extra stat.
+        """
+        try:
+            with os.scandir(self._prefixes[status]) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith("task_") and name.endswith(".json") and entry.is_file():
+                        yield entry
+        except FileNotFoundError:
+            return
+
+    def _interior_durable(self) -> bool:
+        """Whether this non-terminal rewrite should be fsynced."""
+        if self._fsync_every <= 0:
+            return False
+        return next(self._interior_writes) % self._fsync_every == 0
+
+    @property
+    def pending_dir(self) -> Path:
+        """Directory holding PENDING task files (watched by the watcher)."""
+        return self._dir_for(TaskStatus.PENDING)
 
     # ── Core operations ──────────────────────────────────────────────
 
@@ -87,57 +199,160 @@ class TaskQueue:
 
         Returns the created Task with its auto-generated ID.
         """
-        task = Task(
-            instructions=instructions,
-            agent=agent,
-            action=action,
-            target_files=target_files or [],
-            context=context,
-            priority=priority,
-            agent_type=agent_type,
+        task = _new_task(
+            instructions, agent, action, target_files, context, priority, agent_type
         )
-        dest = self._dir_for(TaskStatus.PENDING) / task.filename
-        task.save(dest)
-        logger.info("Created task %s at %s", task.id, dest)
+        self._save_new(task)
         return task
 
+    def create_tasks(self, specs: Iterable[dict[str, Any]]) -> list[Task]:
+        """
+        Create several PENDING tasks; each spec holds create_task's keyword
+        arguments. Same result as create_task per spec, but the files of a
+        batch are all written before any is fsynced, so the filesystem can
+        flush them together. If it raises, tasks already created stay.
+        """
+        prefix = self._prefixes[_PENDING]
+        created: list[Task] = []
+        specs = iter(specs)
+        # Batches bound the number of temp files held open at once
+        while batch := [_new_task(**spec) for spec in itertools.islice(specs, _CREATE_BATCH)]:
+            tmps = _write_temps([(prefix + t.filename, t.to_bytes(), t.id) for t in batch])
+            done = 0
+            try:
+                for task, tmp in zip(batch, tmps):
+                    dest = prefix + task.filename
+                    try:
+                        _rename_noreplace(tmp, dest)
+                    except FileExistsError:
+                        # Id clash: the contents carry the id, so write anew
+                        _unlink_quietly(tmp)
+                        task.id = _new_task_id()
+                        self._save_new(task)
+                    else:
+                        self._locations[task.id] = _PENDING
+                        self._dirty.add(prefix)
+                        logger.info("Created task %s at %s", task.id, dest)
+                    done += 1
+            finally:
+                for tmp in tmps[done:]:
+                    _unlink_quietly(tmp)
+            created.extend(batch)
+        return created
+
+    def _save_new(self, task: Task) -> None:
+        """Write a new task into pending/, re-rolling its id on a clash."""
+        prefix = self._prefixes[_PENDING]
+        while True:
+            dest = prefix + task.filename
+            try:
+                # Ids are 32 random bits: a clash is rare, but must never
+                # silently overwrite another pending task
+                task.save(dest, exclusive=True)
+                break
+            except FileExistsError:
+                task.id = _new_task_id()
+        self._locations[task.id] = _PENDING
+        self._dirty.add(prefix)
+        logger.info("Created task %s at %s", task.id, dest)
+
     def get_task(self, task_id: str) -> Optional[Task]:
         """
         Find a task by ID across all status directories.
         Returns None if not found.
         """
-        path = self._find_task_path(task_id)
-        if path is None:
-            return None
+        return self._read_task(task_id)[1]
+
+    def _read_task(self, task_id: str) -> tuple[Optional[str], Optional[Task]]:
+        """
+        Locate and parse a task: (path, task), or (None, None) if
+        absent/unreadable. Goes through list_tasks' parse cache, checked
+        against the stat the lookup makes anyway, so re-reading an
+        unchanged task costs no open or JSON parse.
+        """
+        found = self._locate(task_id)
+        if found is None:
+            return None, None
+        status, path, st = found
+        name = f"task_{task_id}.json"
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached = self._parse_cache[status].get(name)
+        if cached is not None and cached[0] == key:
+            return path, Task.from_dict(cached[1])
         try:
-            return Task.from_file(path)
+            task = Task.from_file(path, st.st_size)
         except (json.JSONDecodeError, KeyError, TypeError) as e:
             logger.warning("Failed to parse task %s: %s", path, e)
-            return None
+            return None, None
+        with self._parse_locks[status]:
+            self._parse_cache[status][name] = (key, task.to_dict())
+        return path, task
 
-    def _find_task_path(self, task_id: str) -> Optional[Path]:
+    def _forget_parse(self, status: TaskStatus, filename: str) -> None:
+        """
+        Drop a moved-away file from its old status dir's parse cache. A
+        scan of that dir would prune it too, but running/ is only ever
+        read by lookups, so without this its entries would pile up.
+        """
+        with self._parse_locks[status]:
+            self._parse_cache[status].pop(filename, None)
+
+    def _find_task_path(self, task_id: str) -> Optional[str]:
         """Locate the file path for a task by ID."""
+        found = self._locate(task_id)
+        return None if found is None else found[1]
+
+    def _locate(self, task_id: str) -> Optional[tuple[TaskStatus, str, os.stat_result]]:
+        """Find a task file: (status, path, stat result), or None."""
         filename = f"task_{task_id}.json"
-        for status_dir in _STATUS_DIRS.values():
-            path = self.root / status_dir / filename
-            if path.exists():
-                return path
+        hint = self._locations.get(task_id)
+        if hint is not None:
+            path = self._prefixes[hint] + filename
+            try:
+                return hint, path, os.stat(path)
+            except FileNotFoundError:
+                pass  # moved by another process; probe the rest
+        for status, prefix in self._prefix_items:
+            if status is hint:
+                continue
+            path = prefix + filename
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if status in _TERMINAL_STATUSES:
+                self._locations.pop(task_id, None)
+            else:
+                self._locations[task_id] = status
+            return status, path, st
+        self._locations.pop(task_id, None)
         return None
 
-    def _replace_status_file(self, task_id: str, from_status: TaskStatus, to_status: TaskStatus) -> Path:
+    def _replace_status_file(self, task_id: str, from_status: TaskStatus, to_status: TaskStatus) -> str:
         """
         Atomically move a task file from one status directory to another.
         Raises FileNotFoundError if the source is missing to indicate a
-        concurrent move/claim by another process.
+        concurrent move/claim by another process, and FileExistsError
+        rather than overwrite a task file already at the destination.
         """
         filename = f"task_{task_id}.json"
-        src = self._dir_for(from_status) / filename
-        dst_dir = self._dir_for(to_status)
-        dst_dir.mkdir(parents=True, exist_ok=True)
-        dst = dst_dir / filename
+        src_prefix = self._prefixes[from_status]
+        dst_prefix = self._prefixes[to_status]
+        src = src_prefix + filename
+        dst = dst_prefix + filename
 
         try:
-            os.replace(str(src), str(dst))
+            try:
+                _rename_noreplace(src, dst)
+            except FileNotFoundError:
+                dst_dir = self._dirs[to_status]
+                if dst_dir.is_dir():
+                    raise
+                # Status dir removed under us; recreate it and retry once
+                dst_dir.mkdir(parents=True, exist_ok=True)
+                _rename_noreplace(src, dst)
+            self._dirty.update((src_prefix, dst_prefix))
+            self._forget_parse(from_status, filename)
             logger.info("Atomically moved %s -> %s", src, dst)
         except FileNotFoundError:
             logger.error("Failed to move task %s: source not found %s", task_id, src)
@@ -148,46 +363,68 @@ class TaskQueue:
 
         return dst
 
-    def _move_task(self, task: Task, new_status: TaskStatus) -> Path:
+    def _move_task(self, task: Task, new_status: TaskStatus, old_path: Optional[str] = None) -> str:
         """
         Atomically move a task file from its current directory to the new
         status dir using os.replace. If another process removed the
         source before replace, raise FileNotFoundError to indicate a
         conflicting move.
 
-        Updates the task's status field and re-saves atomically.
+        The updated contents are written (and fsynced) to a temp file in
+        the destination first, so the move itself is two back-to-back
+        renames: readers of the new location see the stale contents only
+        between them, not for the duration of a write + fsync.
+
+        Callers that just read the task pass the file they read as
+        old_path, which saves a lookup and moves exactly the file whose
+        status they checked.
         """
-        old_path = self._find_task_path(task.id)
         if old_path is None:
-            raise FileNotFoundError(f"Task {task.id} not found in queue")
+            old_path = self._find_task_path(task.id)
+            if old_path is None:
+                raise FileNotFoundError(f"Task {task.id} not found in queue")
 
-        new_dir = self._dir_for(new_status)
-        new_dir.mkdir(parents=True, exist_ok=True)
-        new_path = new_dir / task.filename
+        new_prefix = self._prefixes[new_status]
+        new_path = new_prefix + task.filename
 
         if old_path == new_path:
             # Same location — just update contents
             task.save(new_path)
+            self._dirty.add(new_prefix)
             logger.info("Updated task %s in place at %s", task.id, new_path)
             return new_path
 
+        tmp = _write_temp(new_path, task.to_bytes(), task.id)
         try:
-            # Atomic filesystem move/replace
-            os.replace(str(old_path), str(new_path))
+            # Atomic filesystem move/replace; doubles as the ownership check
+            os.replace(old_path, new_path)
+            old_prefix = os.path.join(os.path.dirname(old_path), "")
+            self._dirty.update((old_prefix, new_prefix))
+            old_status = self._status_by_prefix.get(old_prefix)
+            if old_status is not None:
+                self._forget_parse(old_status, task.filename)
             logger.info("Atomically moved %s -> %s", old_path, new_path)
         except FileNotFoundError:
             # Source disappeared — someone else claimed/moved it
+            _unlink_quietly(tmp)
             logger.error("Failed to move task %s: source not found %s", task.id, old_path)
             raise FileNotFoundError(f"Task {task.id} was moved by another process")
         except OSError as e:
+            _unlink_quietly(tmp)
             logger.error("Failed to move task %s from %s to %s: %s", task.id, old_path, new_path, e)
             raise
 
-        # Now update the task content atomically at the new location
+        if new_status in _TERMINAL_STATUSES:
+            self._locations.pop(task.id, None)
+        else:
+            self._locations[task.id] = new_status
+
+        # Publish the prepared contents at the new location
         try:
-            task.save(new_path)
+            os.replace(tmp, new_path)
             logger.info("Saved updated task %s at %s", task.id, new_path)
-        except Exception as e:
+        except OSError as e:
+            _unlink_quietly(tmp)
             logger.error("Failed to save task %s after move: %s", task.id, e)
             raise
 
@@ -199,52 +436,49 @@ class TaskQueue:
         from pending/ to running/. If the source file is missing at rename
         time it is treated as already claimed by another process.
         """
-        filename = f"task_{task_id}.json"
-        pending_path = self._dir_for(TaskStatus.PENDING) / filename
-        running_dir = self._dir_for(TaskStatus.RUNNING)
-        running_dir.mkdir(parents=True, exist_ok=True)
-        running_path = running_dir / filename
-
-        if not pending_path.exists():
-            # Check if task exists in another status directory
-            task = self.get_task(task_id)
-            if task is not None:
-                logger.info("Claim attempted for %s but status is %s, expected PENDING", task_id, task.status)
-                raise ValueError(f"Task {task_id} is {task.status.value}, expected PENDING")
-            logger.error("Claim attempted for %s but not found", task_id)
-            raise ValueError(f"Task {task_id} not found")
-
-        # Delegate atomic move to helper which preserves race semantics
+        # No exists() pre-check: the rename itself is the test, and the
+        # diagnostic lookup below only runs when it fails.
         try:
-            new_path = self._replace_status_file(task_id, TaskStatus.PENDING, TaskStatus.RUNNING)
-            logger.info("Atomically claimed task %s: %s -> %s", task_id, pending_path, new_path)
+            new_path = self._replace_status_file(task_id, _PENDING, _RUNNING)
+            self._locations[task_id] = _RUNNING
+            logger.info("Atomically claimed task %s -> %s", task_id, new_path)
         except FileNotFoundError:
-            logger.info("Claim race: task %s missing at rename time", task_id)
-            raise ValueError(f"Task {task_id} already claimed")
+            task = self.get_task(task_id)
+            if task is None:
+                logger.error("Claim attempted for %s but not found", task_id)
+                raise ValueError(f"Task {task_id} not found")
+            if task.status == _PENDING:
+                # Renamed by another claimer that hasn't rewritten it yet
+                logger.info("Claim race: task %s missing at rename time", task_id)
+                raise ValueError(f"Task {task_id} already claimed")
+            logger.info("Claim attempted for %s but status is %s, expected PENDING", task_id, task.status)
+            raise ValueError(f"Task {task_id} is {task.status.value}, expected PENDING")
+        except FileExistsError:
+            # Same id already in running/ (an id clash): leave both alone
+            logger.error("Claim of %s blocked: file already in running/", task_id)
+            raise ValueError(f"Task {task_id} already has a file in running/")
         except OSError as e:
             logger.error("Failed to claim task %s: %s", task_id, e)
             raise
 
-        # Load, mark running and save atomically
+        # Load, mark running and save atomically. The pending index usually
+        # holds the task already: one stat proving the renamed file is the
+        # one it parsed replaces open + fstat + read + close + JSON parse.
+        with self._pending_lock:
+            cached = self._pending_index.pop(f"task_{task_id}.json", None)
         try:
-            task = Task.from_file(new_path)
+            if cached is not None and os.stat(new_path).st_ino == cached[2]:
+                task = Task.from_dict(cached[1])
+            else:
+                task = Task.from_file(new_path)
         except (json.JSONDecodeError, KeyError, TypeError) as e:
-            quarantine_dir = self.root / "quarantine"
-            quarantine_dir.mkdir(parents=True, exist_ok=True)
-            qpath = quarantine_dir / running_path.name
-            try:
-                os.replace(str(new_path), str(qpath))
-                logger.warning("Quarantined malformed task %s -> %s: %s", new_path, qpath, e)
-            except FileNotFoundError:
-                logger.warning("Malformed task disappeared before quarantine: %s", new_path)
-            except Exception as ex:
-                logger.error("Failed to quarantine malformed task %s: %s", new_path, ex)
+            self._quarantine(Path(new_path), e)
             raise ValueError(f"Task {task_id} file is malformed") from e
-        if task.status != TaskStatus.PENDING:
+        if task.status != _PENDING:
             logger.error("Claimed task %s had unexpected status %s", task_id, task.status)
             raise ValueError(f"Task {task_id} had unexpected status {task.status}")
         task.mark_running()
-        task.save(new_path)
+        task.save(new_path, durable=self._interior_durable())
         logger.info("Task %s marked RUNNING", task_id)
         return task
 
@@ -252,63 +486,155 @@ class TaskQueue:
         """
         Move a task from RUNNING → COMPLETED with a result summary.
         """
-        task = self.get_task(task_id)
+        path, task = self._read_task(task_id)
         if task is None:
             raise ValueError(f"Task {task_id} not found")
-        if task.status != TaskStatus.RUNNING:
+        if task.status != _RUNNING:
             raise ValueError(
                 f"Task {task_id} is {task.status.value}, expected RUNNING"
             )
         task.mark_completed(result)
-        self._move_task(task, TaskStatus.COMPLETED)
+        self._move_task(task, TaskStatus.COMPLETED, path)
         return task
 
     def fail_task(self, task_id: str, error: str) -> Task:
         """
         Move a task from RUNNING → FAILED with an error message.
         """
-        task = self.get_task(task_id)
+        path, task = self._read_task(task_id)
         if task is None:
             raise ValueError(f"Task {task_id} not found")
         task.mark_failed(error)
-        self._move_task(task, TaskStatus.FAILED)
+        self._move_task(task, TaskStatus.FAILED, path)
         return task
 
     # ── Queries ──────────────────────────────────────────────────────
 
-    def list_tasks(self, status: Optional[TaskStatus] = None) -> list[Task]:
+    def list_tasks(self, status: Optional[TaskStatus] = None, sort: bool = True) -> list[Task]:
         """
         List all tasks, optionally filtered by status.
-        Sorted by priority (descending) then creation time (ascending).
+        Sorted by priority (descending) then creation time (ascending);
+        sort=False returns them in directory order, which is cheaper for
+        callers that only count or aggregate.
         """
-        tasks: list[Task] = []
-        statuses = [status] if status else list(TaskStatus)
+        if status:
+            tasks = self._scan_status(status)
+        else:
+            tasks = []
+            for s in _ALL_STATUSES:
+                tasks.extend(self._scan_status(s))
+
+        if sort:
+            # Two stable passes with C-level keys instead of building a
+            # (-priority, created_at) tuple per task in a lambda
+            tasks.sort(key=attrgetter("created_at"))
+            tasks.sort(key=attrgetter("priority"), reverse=True)
+        return tasks
 
-        for s in statuses:
-            dir_path = self._dir_for(s)
-            for file in dir_path.glob("task_*.json"):
+    def _scan_status(self, status: TaskStatus) -> list[Task]:
+        """
+        Load every task in one status dir, through the parse cache. Each
+        status has its own lock, so threads listing different status dirs
+        don't wait on each other.
+        """
+        tasks: list[Task] = []
+        with self._parse_locks[status]:
+            cache = self._parse_cache[status]
+            present: set[str] = set()
+            for entry in self._task_entries(status):
+                name = entry.name
+                file = entry.path
                 try:
-                    tasks.append(Task.from_file(file))
+                    st = entry.stat()
+                    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+                    cached = cache.get(name)
+                    if cached is not None and cached[0] == key:
+                        tasks.append(Task.from_dict(cached[1]))
+                    else:
+                        task = Task.from_file(file, st.st_size)
+                        cache[name] = (key, task.to_dict())
+                        tasks.append(task)
+                except FileNotFoundError:
+                    # Moved by another process since the scan
+                    continue
                 except (json.JSONDecodeError, KeyError, TypeError) as e:
                     # Quarantine malformed task files instead of silently skipping
-                    quarantine_dir = self.root / "quarantine"
-                    quarantine_dir.mkdir(parents=True, exist_ok=True)
-                    qpath = quarantine_dir / file.name
-                    try:
-                        os.replace(str(file), str(qpath))
-                        logger.warning("Quarantined malformed task %s -> %s: %s", file, qpath, e)
-                    except FileNotFoundError:
-                        logger.warning("Malformed task disappeared before quarantine: %s", file)
-                    except Exception as ex:
-                        logger.error("Failed to quarantine malformed task %s: %s", file, ex)
+                    self._quarantine(Path(file), e)
                     continue
-
-        tasks.sort(key=lambda t: (-t.priority, t.created_at))
+                present.add(name)
+            for name in cache.keys() - present:
+                del cache[name]
         return tasks
 
-    def get_pending_tasks(self) -> list[Task]:
-        """Get all pending tasks, highest priority first."""
-        return self.list_tasks(status=TaskStatus.PENDING)
+    def _quarantine(self, file: Path, error: Exception) -> None:
+        """Move a malformed task file into quarantine/ (best effort)."""
+        quarantine_dir = self.root / "quarantine"
+        quarantine_dir.mkdir(parents=True, exist_ok=True)
+        qpath = quarantine_dir / file.name
+        try:
+            os.replace(file, qpath)
+            logger.warning("Quarantined malformed task %s -> %s: %s", file, qpath, error)
+        except FileNotFoundError:
+            logger.warning("Malformed task disappeared before quarantine: %s", file)
+        except Exception as ex:
+            logger.error("Failed to quarantine malformed task %s: %s", file, ex)
+
+    def get_pending_tasks(self, limit: Optional[int] = None) -> list[Task]:
+        """
+        Get all pending tasks, highest priority first.
+        With a limit, only the first `limit` in pick order are returned,
+        selected without sorting the rest.
+
+        Only files not seen by a previous call are read and parsed; the
+        rest come from the pending index (see module notes).
+        """
+        return [Task.from_dict(data) for data in self._scan_pending(limit)]
+
+    def get_pending_headers(self, limit: Optional[int] = None) -> list[TaskHeader]:
+        """
+        Like get_pending_tasks, but without materializing Task objects.
+        With a limit, only the first `limit` in pick order are returned.
+        """
+        return [
+            TaskHeader(data["id"], data["priority"], data["created_at"])
+            for data in self._scan_pending(limit)
+        ]
+
+    def _scan_pending(self, limit: Optional[int] = None) -> list[dict]:
+        """
+        Refresh the pending index and return its task dicts in pick order
+        (only the top `limit`, selected without a full sort, if given).
+        """
+        with self._pending_lock:
+            index = self._pending_index
+            present: set[str] = set()
+            for entry in self._task_entries(_PENDING):
+                name = entry.name
+                present.add(name)
+                # The inode comes with the directory listing on POSIX, so
+                # checking it is free and catches a file replaced in place
+                ino = entry.inode()
+                cached = index.get(name)
+                if cached is not None and cached[2] == ino:
+                    continue
+                try:
+                    task = Task.from_file(entry.path)
+                except FileNotFoundError:
+                    # Claimed/moved by someone else since the scan
+                    present.discard(name)
+                    continue
+                except (json.JSONDecodeError, KeyError, TypeError) as e:
+                    self._quarantine(Path(entry.path), e)
+                    present.discard(name)
+                    continue
+                index[name] = ((-task.priority, task.created_at), task.to_dict(), ino)
+            for name in index.keys() - present:
+                del index[name]
+            if limit is None:
+                ordered = sorted(index.values(), key=itemgetter(0))
+            else:
+                ordered = heapq.nsmallest(limit, index.values(), key=itemgetter(0))
+        return [data for _, data, _ in ordered]
 
     def get_running_tasks(self) -> list[Task]:
         """Get all currently running tasks."""
@@ -318,30 +644,88 @@ class TaskQueue:
         """Get all completed tasks."""
         return self.list_tasks(status=TaskStatus.COMPLETED)
 
-    def clear_completed(self) -> int:
-        """Remove all completed task files. Returns count of removed tasks."""
-        completed_dir = self._dir_for(TaskStatus.COMPLETED)
+    def _clear(self, status: TaskStatus) -> int:
+        """
+        Unlink every task file in a status dir, one entry at a time: the
+        directory itself stays, so a task being moved in concurrently is
+        never lost. Entries removed by someone else meanwhile are skipped.
+        """
+        # Only names are needed here, so listdir's plain strings beat
+        # scandir's DirEntry objects
+        prefix = self._prefixes[status]
+        try:
+            names = os.listdir(prefix)
+        except FileNotFoundError:
+            names = []
         count = 0
-        for file in completed_dir.glob("task_*.json"):
-            file.unlink()
+        for name in names:
+            if not (name.startswith("task_") and name.endswith(".json")):
+                continue
+            try:
+                os.unlink(prefix + name)
+            except (FileNotFoundError, IsADirectoryError):
+                continue
             count += 1
+        if count:
+            self._dirty.add(prefix)
+        with self._parse_locks[status]:
+            self._parse_cache[status].clear()
+        # No hints to drop: finished tasks are never hinted (see _locate)
         return count
 
+    def clear_completed(self) -> int:
+        """Remove all completed task files. Returns count of removed tasks."""
+        return self._clear(TaskStatus.COMPLETED)
+
     def clear_failed(self) -> int:
         """Remove all failed task files. Returns count of removed tasks."""
-        failed_dir = self._dir_for(TaskStatus.FAILED)
-        count = 0
-        for file in failed_dir.glob("task_*.json"):
-            file.unlink()
-            count += 1
-        return count
+        return self._clear(TaskStatus.FAILED)
+
+    def flush(self) -> None:
+        """
+        Make the queue's directory changes so far durable: fsync each
+        status dir a create, move or clear has touched since the last
+        flush. Task contents are fsynced when written (see module notes);
+        the renames publishing them are only durable once their directory
+        is. Where directories can't be opened (Windows) this is a no-op.
+        """
+        dirty = self._dirty
+        for prefix in list(dirty):
+            # Discarded first: a change made meanwhile stays for next time
+            dirty.discard(prefix)
+            try:
+                fd = os.open(prefix, _O_DIRECTORY)
+            except OSError:
+                continue
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass  # fsync on a directory isn't supported everywhere
+            finally:
+                os.close(fd)
 
     def stats(self) -> dict[str, int]:
-        """Return a count of tasks per status."""
-        return {
-            status.value: len(list(self._dir_for(status).glob("task_*.json")))
-            for status in TaskStatus
-        }
+        """
+        Return a count of tasks per status.
+
+        Counts directory entries only — task files are never opened.
+        """
+        return {status.value: self._count_task_files(status) for status in _ALL_STATUSES}
+
+    def _count_task_files(self, status: TaskStatus) -> int:
+        """
+        Count task_*.json files in a status directory. Same filter as
+        _task_entries, inlined: a list comprehension over the listing
+        avoids resuming a generator per entry.
+        """
+        try:
+            with os.scandir(self._prefixes[status]) as it:
+                return len([
+                    entry for entry in it
+                    if (name := entry.name).startswith("task_") and name.endswith(".json") and entry.is_file()
+                ])
+        except FileNotFoundError:
+            return 0
 
     def __repr__(self) -> str:
         s = self.stats()
@@ -350,3 +734,22 @@ class TaskQueue:
             f"pending={s['PENDING']}, running={s['RUNNING']}, "
             f"completed={s['COMPLETED']}, failed={s['FAILED']})"
         )
+
+
+QUEUE_BACKENDS = ("files", "sqlite")
+
+
+def open_queue(root: Path | str, backend: str = "files", fsync_every: int = 1):
+    """
+    Open the task queue rooted at `root` using the configured backend.
+
+    "files" is the default one-JSON-file-per-task layout (TaskQueue);
+    "sqlite" keeps every task in a single WAL-mode database, whose own
+    commit durability makes `fsync_every` irrelevant there.
+    """
+    if backend == "files":
+        return TaskQueue(root, fsync_every=fsync_every)
+    if backend == "sqlite":
+        from .sqlite_queue import SQLiteTaskQueue
+        return SQLiteTaskQueue(root)
+    raise ValueError(f"Unknown queue backend '{backend}', expected one of {QUEUE_BACKENDS}")
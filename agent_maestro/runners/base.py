@@ -7,6 +7,7 @@ and returns a RunResult.
 
 from __future__ import annotations
 
+import os
 from abc import ABC, abstractmethod
 from pathlib import Path
 
@@ -28,6 +29,10 @@ class BaseRunner(ABC):
         """
         Execute a task using the sub-agent.
 
+        The watcher calls this on one of its worker threads, never on the
+        polling thread, so it may block for as long as the task takes and
+        must not rely on running in the main thread.
+
         Args:
             task:         The task to execute.
             project_root: Absolute path to the project root.
@@ -76,6 +81,8 @@ class BaseRunner(ABC):
 
         project_root_path = Path(project_root).resolve()
         validated: list[str] = []
+        # Target files tend to share directories: resolve each one once
+        resolved_dirs: dict[Path, Path] = {}
 
         for p in target_files:
             if not isinstance(p, str) or p == "":
@@ -91,8 +98,16 @@ class BaseRunner(ABC):
             if ".." in candidate.parts:
                 raise ValueError(f"Parent directory segments ('..') are not allowed: {p}")
 
-            # Resolve against project root and ensure it's inside project_root
-            resolved = (project_root_path / candidate).resolve()
+            # Resolve against project root and ensure it's inside project_root.
+            # Same result as resolving the whole path, but only the file
+            # itself costs a syscall once its directory has been seen.
+            parent = candidate.parent
+            resolved_dir = resolved_dirs.get(parent)
+            if resolved_dir is None:
+                resolved_dir = resolved_dirs[parent] = (project_root_path / parent).resolve()
+            resolved = resolved_dir / candidate.name
+            if os.path.islink(resolved):
+                resolved = resolved.resolve()
             try:
                 rel = resolved.relative_to(project_root_path)
             except Exception:
@@ -23,6 +23,7 @@ import shutil
 import os
 import logging
 import stat
+import threading
 import traceback
 from pathlib import Path
 
@@ -31,6 +32,95 @@ from .base import BaseRunner
 
 logger = logging.getLogger(__name__)
 
+# Tokens allowed in extra_args: a flag, or a plain value (no shell metachars)
+_SAFE_FLAG_RE = re.compile(r"^-{1,2}[A-Za-z0-9][A-Za-z0-9_\-]*$")
+_SAFE_VAL_RE = re.compile(r"^[A-Za-z0-9@._:/\\\-]+$")
+
+# POSIX children can open an inherited fd as /dev/fd/N, so the prompt
+# never has to touch the disk there: on Linux it goes into a memfd (an
+# in-memory regular file, written up front), elsewhere into a pipe fed by
+# a thread. Windows keeps the temp-file route.
+_PROMPT_VIA_FD = os.name == "posix"
+_PROMPT_VIA_MEMFD = _PROMPT_VIA_FD and hasattr(os, "memfd_create")
+
+
+# Simplified role instructions - just the essence of each role
+_ROLE_INSTRUCTIONS: dict[str, str] = {
+    "implementer": "You are implementing code changes. Follow existing patterns, update tests if they exist, keep changes minimal and focused.",
+    "tester": "You are writing tests. Create comprehensive test coverage (happy path, edge cases, errors). Use the project's test framework patterns. Run tests after creating them.",
+    "reviewer": "You are reviewing code. Check for bugs, security issues, performance problems, and adherence to patterns. Provide structured feedback. Do not modify files.",
+}
+
+# Only the tail of the child's output is kept (it ends with the summary)
+_MAX_CAPTURE = 256 * 1024
+# How long to wait for output after the child exits; a grandchild that
+# inherited stdout can keep the pipe open indefinitely
+_OUTPUT_GRACE_SECONDS = 5.0
+
+
+class _TailBuffer:
+    """Collects a stream in memory, keeping only its last `limit` bytes."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._buf = bytearray()
+        self._lock = threading.Lock()
+
+    def drain(self, stream) -> None:
+        """Read `stream` to EOF (run in a thread)."""
+        readinto = getattr(stream, "readinto1", None)
+        if readinto is None:
+            return self._drain_chunks(stream)
+        # One reusable scratch buffer: no bytes object per chunk
+        scratch = bytearray(65536)
+        view = memoryview(scratch)
+        try:
+            while n := readinto(view):
+                self._append(view[:n])
+        except (OSError, ValueError):
+            pass  # pipe closed under us
+
+    def _drain_chunks(self, stream) -> None:
+        read = getattr(stream, "read1", stream.read)
+        try:
+            while chunk := read(65536):
+                self._append(chunk)
+        except (OSError, ValueError):
+            pass  # pipe closed under us
+
+    def _append(self, chunk) -> None:
+        with self._lock:
+            buf = self._buf
+            buf += chunk
+            # Trim in bulk so the copy cost stays amortized O(1)
+            if len(buf) > 2 * self.limit:
+                del buf[:-self.limit]
+
+    def getvalue(self) -> bytes:
+        with self._lock, memoryview(self._buf) as view:
+            return bytes(view[-self.limit:])
+
+    def text(self) -> str:
+        """The kept tail decoded as UTF-8, straight from the buffer."""
+        with self._lock, memoryview(self._buf) as view:
+            return str(view[-self.limit:], "utf-8", "replace")
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _feed_pipe(fd: int, data: bytes) -> None:
+    """Write data to a pipe and close it. A reader that exits early is fine."""
+    try:
+        _write_all(fd, data)
+    except OSError:
+        pass  # BrokenPipeError: the child didn't read it all
+    finally:
+        os.close(fd)
+
 
 class CopilotRunner(BaseRunner):
     """
@@ -62,20 +152,42 @@ class CopilotRunner(BaseRunner):
         self.allow_all_paths = allow_all_paths
         self.extra_args = extra_args or []
         self.timeout_seconds = int(timeout_seconds)
+        # (copilot_command, resolved executable) from the last successful lookup
+        self._resolved_exe: tuple[str, str] | None = None
+
+    def _resolve_executable(self) -> str | None:
+        """
+        Locate copilot_command, caching the hit: shutil.which walks $PATH
+        on every call. Misses aren't cached, so installing the CLI while
+        the watcher runs still works; execute() drops a hit that no
+        longer starts, so moving it does too.
+        """
+        command = self.copilot_command
+        cached = self._resolved_exe
+        if cached is not None and cached[0] == command:
+            return cached[1]
+        exe = shutil.which(command)
+        # If an absolute path was provided, check directly
+        if not exe and os.path.isabs(command) and os.access(command, os.X_OK):
+            exe = command
+        if exe:
+            self._resolved_exe = (command, exe)
+        return exe
 
     def execute(self, task: Task, project_root: str | Path) -> RunResult:
         """
-        Execute a task by invoking `copilot -p <prompt>`.
+        Execute a task by invoking `copilot -p <prompt file>`.
 
-        Writes the prompt to a temp file to avoid shell escaping issues
-        on Windows (bat → powershell → copilot chain).
+        The prompt is passed as a file path to avoid shell escaping issues
+        on Windows (bat → powershell → copilot chain): /dev/fd/N backed by
+        a memfd or pipe on POSIX, a private temp file elsewhere.
 
         Always uses the default agent for full file write capabilities.
         If agent_type is set, injects specialized instructions from
         .github/agents/<agent_type>.agent.md into the prompt.
         """
         # Normalize project_root to str
-        project_root = str(Path(project_root))
+        project_root = os.fspath(project_root)
         # Validate target files to prevent path traversal
         try:
             validated_files = self.validate_target_files(task.target_files, project_root)
@@ -87,55 +199,23 @@ class CopilotRunner(BaseRunner):
 
         prompt = self.build_prompt(task, project_root)
 
-        # Create a secure temp file for the prompt (avoid mktemp races)
-        prompt_tmp = tempfile.NamedTemporaryFile(
-            prefix="copilot_prompt_",
-            suffix=".txt",
-            delete=False,
-            mode="w",
-            encoding="utf-8",
-        )
-        prompt_path = Path(prompt_tmp.name)
-        output_tmp = None
+        prompt_path: Path | None = None
+        prompt_r: int | None = None  # pipe read end, inherited by the child
+        prompt_w: int | None = None
         try:
-            # Write and flush securely
-            prompt_tmp.write(prompt)
-            prompt_tmp.flush()
-            try:
-                os.fsync(prompt_tmp.fileno())
-            except Exception:
-                # os.fsync may not be available on some platforms; ignore
-                pass
-            prompt_tmp.close()
-
-            # Restrict permissions to owner only where supported
-            try:
-                os.chmod(prompt_path, stat.S_IRUSR | stat.S_IWUSR)
-            except Exception:
-                pass
-
             # Validate copilot_command exists and is executable
-            copilot_exe = shutil.which(self.copilot_command)
+            copilot_exe = self._resolve_executable()
             if not copilot_exe:
-                # If an absolute path was provided, check directly
-                if Path(self.copilot_command).is_absolute() and os.access(self.copilot_command, os.X_OK):
-                    copilot_exe = self.copilot_command
-                else:
-                    msg = (
-                        f"Command '{self.copilot_command}' not found or not executable. "
-                        "Install Copilot CLI: https://docs.github.com/en/copilot/how-tos/set-up/install-copilot-cli"
-                    )
-                    logger.error(msg)
-                    return RunResult(success=False, error=msg)
+                msg = (
+                    f"Command '{self.copilot_command}' not found or not executable. "
+                    "Install Copilot CLI: https://docs.github.com/en/copilot/how-tos/set-up/install-copilot-cli"
+                )
+                logger.error(msg)
+                return RunResult(success=False, error=msg)
 
             # Sanitize extra_args: allow only safe flag/value tokens
-            safe_flag_re = re.compile(r"^-{1,2}[A-Za-z0-9][A-Za-z0-9_\-]*$")
-            safe_val_re = re.compile(r"^[A-Za-z0-9@._:/\\\-]+$")
-            sanitized_extra: list[str] = []
             for a in self.extra_args:
-                if safe_flag_re.match(a) or safe_val_re.match(a):
-                    sanitized_extra.append(a)
-                else:
+                if not (_SAFE_FLAG_RE.match(a) or _SAFE_VAL_RE.match(a)):
                     msg = f"Invalid extra arg: {a}"
                     logger.warning(msg)
                     return RunResult(success=False, error=msg)
@@ -147,25 +227,59 @@ class CopilotRunner(BaseRunner):
             if self.allow_all_paths:
                 cmd.append("--allow-all-paths")
             cmd.append("--no-ask-user")
-            cmd.extend(sanitized_extra)
+            cmd.extend(self.extra_args)
 
             # Pass prompt file path to avoid shell escaping issues and very long argv
-            cmd.extend(["-p", str(prompt_path)])
+            popen_kwargs: dict = {}
+            if _PROMPT_VIA_MEMFD:
+                prompt_r = os.memfd_create("copilot_prompt", os.MFD_CLOEXEC)
+                _write_all(prompt_r, prompt.encode("utf-8"))
+                os.lseek(prompt_r, 0, os.SEEK_SET)
+                cmd.extend(["-p", f"/dev/fd/{prompt_r}"])
+                popen_kwargs["pass_fds"] = (prompt_r,)
+            elif _PROMPT_VIA_FD:
+                prompt_r, prompt_w = os.pipe()
+                cmd.extend(["-p", f"/dev/fd/{prompt_r}"])
+                popen_kwargs["pass_fds"] = (prompt_r,)
+            else:
+                prompt_path = self._write_prompt_file(prompt)
+                cmd.extend(["-p", str(prompt_path)])
 
-            # Execute process streaming output to temp file to avoid OOM
-            max_capture = 256 * 1024  # 256KB
-            output_tmp = tempfile.NamedTemporaryFile(prefix="copilot_out_", suffix=".log", delete=False, mode="wb")
+            # Stream output through a pipe, keeping a bounded tail in memory
             try:
-                proc = subprocess.Popen(
-                    cmd,
-                    stdout=output_tmp,
-                    stderr=subprocess.STDOUT,
-                    cwd=project_root,
-                )
+                proc = self._spawn(cmd, project_root, popen_kwargs)
             except FileNotFoundError:
-                msg = f"Command '{copilot_exe}' not found when executing."
-                logger.error(msg)
-                return RunResult(success=False, error=msg)
+                # The cached path may be stale (CLI moved or reinstalled):
+                # look it up again and retry once from the new location
+                self._resolved_exe = None
+                fresh_exe = self._resolve_executable()
+                proc = None
+                if fresh_exe and fresh_exe != copilot_exe:
+                    cmd[0] = fresh_exe
+                    try:
+                        proc = self._spawn(cmd, project_root, popen_kwargs)
+                    except FileNotFoundError:
+                        self._resolved_exe = None
+                if proc is None:
+                    msg = f"Command '{copilot_exe}' not found when executing."
+                    logger.error(msg)
+                    return RunResult(success=False, error=msg)
+
+            if prompt_r is not None:
+                # Only the child needs the prompt fd from here on
+                os.close(prompt_r)
+                prompt_r = None
+            if prompt_w is not None:
+                # Feed from a thread so a prompt larger than the pipe
+                # buffer can't block us.
+                threading.Thread(
+                    target=_feed_pipe, args=(prompt_w, prompt.encode("utf-8")), daemon=True
+                ).start()
+                prompt_w = None  # closed by _feed_pipe
+
+            output = _TailBuffer(_MAX_CAPTURE)
+            reader = threading.Thread(target=output.drain, args=(proc.stdout,), daemon=True)
+            reader.start()
 
             try:
                 proc.wait(timeout=self.timeout_seconds)
@@ -174,31 +288,16 @@ class CopilotRunner(BaseRunner):
                     proc.kill()
                 except Exception:
                     pass
-                return RunResult(success=False, error=f"Task timed out after {self.timeout_seconds}s")
-
-            # Ensure output file flushed
-            try:
-                output_tmp.flush()
-                os.fsync(output_tmp.fileno())
-            except Exception:
-                pass
-            output_tmp.close()
-
-            # Read at most last max_capture bytes
-            output_bytes = b""
-            try:
-                with open(output_tmp.name, "rb") as f:
-                    f.seek(0, os.SEEK_END)
-                    size = f.tell()
-                    if size > max_capture:
-                        f.seek(-max_capture, os.SEEK_END)
-                    else:
-                        f.seek(0)
-                    output_bytes = f.read()
-            except Exception:
-                logger.exception("Failed reading process output")
+                proc.wait()  # reap it
+                self._finish_output(proc, reader)
+                return RunResult(
+                    success=False,
+                    output=output.text().strip(),
+                    error=f"Task timed out after {self.timeout_seconds}s",
+                )
 
-            combined_output = output_bytes.decode("utf-8", errors="replace").strip()
+            self._finish_output(proc, reader)
+            combined_output = output.text().strip()
 
             if proc.returncode == 0:
                 out = combined_output or "Task completed (no output captured)."
@@ -212,55 +311,81 @@ class CopilotRunner(BaseRunner):
             msg = f"Runner error: {type(e).__name__}: {str(e)}"
             return RunResult(success=False, error=msg)
         finally:
-            # Clean up temp prompt file
+            # Clean up the prompt pipe / temp prompt file
+            for fd in (prompt_r, prompt_w):
+                if fd is not None:
+                    try:
+                        os.close(fd)
+                    except OSError:
+                        pass
             try:
-                if prompt_path.exists():
+                if prompt_path is not None and prompt_path.exists():
                     prompt_path.unlink()
             except Exception:
                 pass
-            # Clean up output tmp file
-            try:
-                if output_tmp is not None and Path(output_tmp.name).exists():
-                    Path(output_tmp.name).unlink()
-            except Exception:
-                pass
 
-    def build_prompt(self, task: Task, project_root: str) -> str:
+    @staticmethod
+    def _spawn(cmd: list[str], project_root: str, popen_kwargs: dict) -> subprocess.Popen:
+        return subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=project_root,
+            **popen_kwargs,
+        )
+
+    @staticmethod
+    def _finish_output(proc: subprocess.Popen, reader: threading.Thread) -> None:
+        """Give the reader a grace period after exit, then close the pipe."""
+        reader.join(_OUTPUT_GRACE_SECONDS)
+        if reader.is_alive():
+            logger.warning("Output pipe still open after copilot exited; using output so far")
+        else:
+            proc.stdout.close()
+
+    @staticmethod
+    def _write_prompt_file(prompt: str) -> Path:
+        """Write the prompt to an owner-only temp file (non-POSIX fallback)."""
+        # Create a secure temp file for the prompt (avoid mktemp races)
+        with tempfile.NamedTemporaryFile(
+            prefix="copilot_prompt_",
+            suffix=".txt",
+            delete=False,
+            mode="w",
+            encoding="utf-8",
+        ) as prompt_tmp:
+            prompt_tmp.write(prompt)
+        prompt_path = Path(prompt_tmp.name)
+
+        # Restrict permissions to owner only where supported
+        try:
+            os.chmod(prompt_path, stat.S_IRUSR | stat.S_IWUSR)
+        except Exception:
+            pass
+        return prompt_path
+
+    def build_prompt(self, task: Task, project_root: str | None = None) -> str:
         """
         Build a prompt for Copilot CLI. Prepends specialized role instructions
         if agent_type is specified, then adds the actual task.
         """
-        parts: list[str] = []
+        # Common case: nothing but the instructions
+        if not (task.agent_type or task.target_files or task.context):
+            return f"TASK: {task.instructions}"
 
-        # Prepend specialized role instructions if agent_type is specified
+        # Role instructions (if any) go first, separated from the task
+        role = ""
         if task.agent_type:
             role_instructions = self._get_role_instructions(task.agent_type, project_root)
             if role_instructions:
-                parts.append(role_instructions)
-                parts.append("---")  # Separator between role and task
-        
-        # The actual task to execute
-        parts.append(f"TASK: {task.instructions}")
-        
-        if task.target_files:
-            files = ", ".join(task.target_files)
-            parts.append(f"Files: {files}")
-
-        if task.context:
-            parts.append(f"Context: {task.context}")
-
-        return " ".join(parts)
-
-    def _get_role_instructions(self, agent_type: str, project_root: str) -> str | None:
+                role = f"{role_instructions} --- "
+        files = f" Files: {', '.join(task.target_files)}" if task.target_files else ""
+        context = f" Context: {task.context}" if task.context else ""
+        return f"{role}TASK: {task.instructions}{files}{context}"
+
+    def _get_role_instructions(self, agent_type: str, project_root: str | None = None) -> str | None:
         """
         Get concise role instructions for the specified agent type.
         Returns a brief role description, not the full .agent.md content.
         """
-        # Simplified role instructions - just the essence of each role
-        roles = {
-            "implementer": "You are implementing code changes. Follow existing patterns, update tests if they exist, keep changes minimal and focused.",
-            "tester": "You are writing tests. Create comprehensive test coverage (happy path, edge cases, errors). Use the project's test framework patterns. Run tests after creating them.",
-            "reviewer": "You are reviewing code. Check for bugs, security issues, performance problems, and adherence to patterns. Provide structured feedback. Do not modify files.",
-        }
-        
-        return roles.get(agent_type)
+        return _ROLE_INSTRUCTIONS.get(agent_type)
@@ -0,0 +1,346 @@
+"""
+SQLite Task Queue — Single-database alternative to the file-based queue.
+
+Selected with `bridge.backend: sqlite` in config.yaml. All tasks live in
+one WAL-mode database under the bridge directory:
+
+    .agent_bridge/
+    └── queue.db       # tasks(id, status, priority, created_at, payload)
+
+Listing, counting and lookups become single indexed queries instead of
+a directory scan plus one JSON parse per task file.
+
+Assumptions and edge cases:
+- Each thread gets its own connection (sqlite3 connections must not be
+  shared across threads); the watcher's worker pool is therefore safe.
+- State changes run inside BEGIN IMMEDIATE transactions, which take the
+  database write lock up front. Two processes claiming the same task are
+  serialized by SQLite: exactly one sees it PENDING.
+- journal_mode=WAL lets readers (maestro list/status) proceed while the
+  watcher writes; synchronous=NORMAL keeps commits durable across process
+  crashes, though the last commits may be lost on power failure.
+- The `status` column is authoritative; `payload` holds the full task
+  JSON and is rewritten on every transition so the two never disagree.
+- The database is the only source of tasks: task files dropped into
+  pending/ (as the file backend accepts) are ignored by this backend.
+- Ids are 32 random bits; an insert that clashes with an existing id is
+  retried under a fresh one rather than failing the create.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from .protocol import Task, TaskHeader, TaskStatus, _dumps_compact, _new_task, _new_task_id
+
+logger = logging.getLogger(__name__)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id          TEXT PRIMARY KEY,
+    status      TEXT NOT NULL,
+    priority    INTEGER NOT NULL,
+    created_at  TEXT NOT NULL,
+    payload     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_by_status
+    ON tasks (status, priority DESC, created_at);
+"""
+
+
+# Claims flip the status column and the payload's copy of it in one
+# UPDATE ... RETURNING (SQLite 3.35+, JSON functions built in since 3.38),
+# which autocommits without a separate BEGIN/SELECT/COMMIT round trip.
+_SINGLE_STATEMENT_CLAIM = sqlite3.sqlite_version_info >= (3, 38, 0)
+_CLAIM_SQL = (
+    "UPDATE tasks SET status = ?1, payload = json_set(payload, '$.status', ?1) "
+    "WHERE id = ?2 AND status = ?3 RETURNING payload"
+)
+
+
+_INSERT_SQL = "INSERT INTO tasks (id, status, priority, created_at, payload) VALUES (?, ?, ?, ?, ?)"
+
+
+class SQLiteTaskQueue:
+    """
+    SQLite-backed task queue with the same interface as TaskQueue.
+
+    Usage:
+        queue = SQLiteTaskQueue(Path(".agent_bridge"))
+        task = queue.create_task(instructions="Write unit tests for utils.py")
+        queue.claim_task(task.id)        # pending → running
+        queue.complete_task(task.id, "Done — 12 tests added.")
+    """
+
+    # No per-status directories to watch; the watcher falls back to polling.
+    pending_dir = None
+
+    def __init__(self, root: Path | str):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / "queue.db"
+        self._local = threading.local()
+        self._conn().executescript(_SCHEMA)
+
+    # ── Connection management ────────────────────────────────────────
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: autocommit; transactions are explicit
+            conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close the calling thread's connection, if any."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @staticmethod
+    def _payload(task: Task) -> str:
+        return _dumps_compact(task.to_dict())
+
+    # ── Core operations ──────────────────────────────────────────────
+
+    def create_task(
+        self,
+        instructions: str,
+        agent: str = "gpt-5-mini",
+        action: str = "implement",
+        target_files: Optional[list[str]] = None,
+        context: str = "",
+        priority: int = 0,
+        agent_type: str = "",
+    ) -> Task:
+        """
+        Create a new PENDING task and persist it.
+
+        Returns the created Task with its auto-generated ID.
+        """
+        task = _new_task(
+            instructions, agent, action, target_files, context, priority, agent_type
+        )
+        self._insert(self._conn(), task)
+        logger.info("Created task %s in %s", task.id, self.db_path)
+        return task
+
+    def create_tasks(self, specs: Iterable[dict[str, Any]]) -> list[Task]:
+        """
+        Create several PENDING tasks; each spec holds create_task's keyword
+        arguments. All are inserted in one transaction: one commit instead
+        of one per task, and either every task is created or none is. An
+        id clash re-rolls that task's id inside the transaction.
+        """
+        tasks = [_new_task(**spec) for spec in specs]
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for task in tasks:
+                self._insert(conn, task)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        for task in tasks:
+            logger.info("Created task %s in %s", task.id, self.db_path)
+        return tasks
+
+    def _insert(self, conn: sqlite3.Connection, task: Task) -> None:
+        """Insert a new task row, re-rolling its id on a clash."""
+        while True:
+            try:
+                conn.execute(_INSERT_SQL, self._row(task))
+                return
+            except sqlite3.IntegrityError as e:
+                if "tasks.id" not in str(e):
+                    raise
+                task.id = _new_task_id()
+
+    def _row(self, task: Task) -> tuple:
+        return (task.id, task.status.value, task.priority, task.created_at, self._payload(task))
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """
+        Find a task by ID.
+        Returns None if not found.
+        """
+        row = self._conn().execute(
+            "SELECT payload FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            return Task.from_json(row[0])
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.warning("Failed to parse task %s: %s", task_id, e)
+            return None
+
+    def _transition(
+        self,
+        task_id: str,
+        expected: Optional[TaskStatus],
+        apply,
+    ) -> Task:
+        """
+        Load a task, check its status, apply a lifecycle change and write it
+        back — all under one write lock so concurrent callers serialize.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT payload FROM tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Task {task_id} not found")
+            task = Task.from_json(row[0])
+            if expected is not None and task.status != expected:
+                raise ValueError(
+                    f"Task {task_id} is {task.status.value}, expected {expected.value}"
+                )
+            apply(task)
+            conn.execute(
+                "UPDATE tasks SET status = ?, payload = ? WHERE id = ?",
+                (task.status.value, self._payload(task), task_id),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return task
+
+    def claim_task(self, task_id: str) -> Task:
+        """
+        Atomically move a task from PENDING → RUNNING. A task claimed by
+        another process first is reported as not PENDING.
+        """
+        if not _SINGLE_STATEMENT_CLAIM:
+            task = self._transition(task_id, TaskStatus.PENDING, Task.mark_running)
+            logger.info("Task %s marked RUNNING", task_id)
+            return task
+
+        conn = self._conn()
+        # fetchall() steps the statement to completion, which commits it
+        rows = conn.execute(
+            _CLAIM_SQL, (TaskStatus.RUNNING.value, task_id, TaskStatus.PENDING.value)
+        ).fetchall()
+        if rows:
+            logger.info("Task %s marked RUNNING", task_id)
+            return Task.from_json(rows[0][0])
+        row = conn.execute("SELECT status FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Task {task_id} not found")
+        raise ValueError(f"Task {task_id} is {row[0]}, expected PENDING")
+
+    def complete_task(self, task_id: str, result: str) -> Task:
+        """
+        Move a task from RUNNING → COMPLETED with a result summary.
+        """
+        return self._transition(
+            task_id, TaskStatus.RUNNING, lambda t: t.mark_completed(result)
+        )
+
+    def fail_task(self, task_id: str, error: str) -> Task:
+        """
+        Move a task from RUNNING → FAILED with an error message.
+        """
+        return self._transition(task_id, None, lambda t: t.mark_failed(error))
+
+    # ── Queries ──────────────────────────────────────────────────────
+
+    def list_tasks(self, status: Optional[TaskStatus] = None, sort: bool = True) -> list[Task]:
+        """
+        List all tasks, optionally filtered by status.
+        Sorted by priority (descending) then creation time (ascending);
+        sort=False leaves the order to SQLite.
+        """
+        conn = self._conn()
+        order = " ORDER BY priority DESC, created_at ASC" if sort else ""
+        if status:
+            rows = conn.execute(
+                "SELECT payload FROM tasks WHERE status = ?" + order,
+                (status.value,),
+            )
+        else:
+            rows = conn.execute("SELECT payload FROM tasks" + order)
+        return [Task.from_json(payload) for (payload,) in rows]
+
+    def get_pending_tasks(self, limit: Optional[int] = None) -> list[Task]:
+        """
+        Get all pending tasks, highest priority first.
+        With a limit, only the first `limit` in pick order are returned.
+        """
+        rows = self._conn().execute(
+            "SELECT payload FROM tasks WHERE status = ? "
+            "ORDER BY priority DESC, created_at ASC LIMIT ?",
+            (TaskStatus.PENDING.value, -1 if limit is None else limit),
+        )
+        return [Task.from_json(payload) for (payload,) in rows]
+
+    def get_pending_headers(self, limit: Optional[int] = None) -> list[TaskHeader]:
+        """
+        Like get_pending_tasks, but reads only the indexed columns.
+        With a limit, only the first `limit` in pick order are returned.
+        """
+        rows = self._conn().execute(
+            "SELECT id, priority, created_at FROM tasks WHERE status = ? "
+            "ORDER BY priority DESC, created_at ASC LIMIT ?",
+            (TaskStatus.PENDING.value, -1 if limit is None else limit),
+        )
+        return [TaskHeader(*row) for row in rows]
+
+    def get_running_tasks(self) -> list[Task]:
+        """Get all currently running tasks."""
+        return self.list_tasks(status=TaskStatus.RUNNING)
+
+    def get_completed_tasks(self) -> list[Task]:
+        """Get all completed tasks."""
+        return self.list_tasks(status=TaskStatus.COMPLETED)
+
+    def _clear(self, status: TaskStatus) -> int:
+        cur = self._conn().execute("DELETE FROM tasks WHERE status = ?", (status.value,))
+        return cur.rowcount
+
+    def clear_completed(self) -> int:
+        """Remove all completed tasks. Returns count of removed tasks."""
+        return self._clear(TaskStatus.COMPLETED)
+
+    def clear_failed(self) -> int:
+        """Remove all failed tasks. Returns count of removed tasks."""
+        return self._clear(TaskStatus.FAILED)
+
+    def flush(self) -> None:
+        """
+        Make every committed change durable. Commits under WAL with
+        synchronous=NORMAL skip the fsync; a checkpoint syncs the WAL.
+        """
+        self._conn().execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def stats(self) -> dict[str, int]:
+        """Return a count of tasks per status."""
+        counts = {status.value: 0 for status in TaskStatus}
+        for status, count in self._conn().execute(
+            "SELECT status, COUNT(*) FROM tasks GROUP BY status"
+        ):
+            counts[status] = count
+        return counts
+
+    def __repr__(self) -> str:
+        s = self.stats()
+        return (
+            f"SQLiteTaskQueue(root={self.root}, "
+            f"pending={s['PENDING']}, running={s['RUNNING']}, "
+            f"completed={s['COMPLETED']}, failed={s['FAILED']})"
+        )
@@ -11,8 +11,12 @@ Usage:
 
 from __future__ import annotations
 
+import ctypes
+import os
+import select
 import signal
 import sys
+import threading
 import time
 import traceback
 from concurrent.futures import ThreadPoolExecutor, Future
@@ -20,7 +24,7 @@ from pathlib import Path
 from typing import Optional
 
 from .protocol import Task, TaskStatus, RunResult
-from .queue import TaskQueue
+from .queue import TaskQueue, open_queue
 from .runners.base import BaseRunner
 from .runners.copilot_runner import CopilotRunner
 
@@ -39,9 +43,114 @@ class _C:
     MAGENTA = "\033[95m"
 
 
+# (epoch second, dimmed "HH:MM:SS " line prefix) for the last second formatted
+_ts_cache: tuple[int, str] = (-1, "")
+_LINE_END = f"{_C.RESET}\n"
+
+
 def _log(icon: str, msg: str, color: str = _C.RESET) -> None:
-    ts = time.strftime("%H:%M:%S")
-    print(f"{_C.DIM}{ts}{_C.RESET} {icon} {color}{msg}{_C.RESET}")
+    global _ts_cache
+    now = int(time.time())
+    sec, prefix = _ts_cache
+    if now != sec:
+        prefix = f"{_C.DIM}{time.strftime('%H:%M:%S', time.localtime(now))}{_C.RESET} "
+        _ts_cache = (now, prefix)
+    # One write per line: print() writes the text and the newline
+    # separately, so lines from concurrent workers could interleave
+    sys.stdout.write(f"{prefix}{icon} {color}{msg}{_LINE_END}")
+
+
+# inotify is Linux-only; a module flag so tests can take the fallback path
+_IS_LINUX = sys.platform.startswith("linux")
+
+
+class _DirNotifier:
+    """
+    Block until something lands in a directory, or a timeout elapses.
+
+    On Linux this uses inotify (through ctypes — no extra dependency) and
+    wakes as soon as a file written in the directory is closed, or one is
+    renamed into it. Not on creation: a task file written in place would
+    then be scanned while still empty or half-written.
+    Elsewhere, without a directory to watch (SQLite backend), or if inotify
+    can't be set up (e.g. watch limit reached), it degrades to a timed
+    wait, i.e. the original fixed-interval poll.
+
+    Either way wake() (e.g. from stop()) ends a wait immediately: a
+    self-pipe watched next to the inotify fd, or an Event for the timed
+    wait.
+    """
+
+    _IN_CLOSE_WRITE = 0x00000008
+    _IN_MOVED_TO = 0x00000080
+
+    def __init__(self, directory: Optional[str | Path]):
+        self._fd: Optional[int] = None
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
+        self._event = threading.Event()
+        if directory is None or not _IS_LINUX:
+            return
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return
+            wd = libc.inotify_add_watch(
+                fd, os.fsencode(str(directory)), self._IN_CLOSE_WRITE | self._IN_MOVED_TO
+            )
+            if wd < 0:
+                os.close(fd)
+                return
+            self._wake_r, self._wake_w = os.pipe()
+            os.set_blocking(self._wake_r, False)
+            os.set_blocking(self._wake_w, False)
+            self._fd = fd
+        except (OSError, AttributeError):
+            pass
+
+    @property
+    def active(self) -> bool:
+        """True when kernel notifications are in use."""
+        return self._fd is not None
+
+    def wait(self, timeout: float) -> None:
+        if self._fd is None:
+            self._event.wait(timeout)
+            self._event.clear()
+            return
+        ready, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+        for fd in ready:
+            self._drain(fd)
+
+    def wake(self) -> None:
+        """End the current (or next) wait() right away. Safe from any thread."""
+        wake_w = self._wake_w
+        if wake_w is None:
+            self._event.set()
+            return
+        try:
+            os.write(wake_w, b"\0")
+        except OSError:
+            pass  # pipe full (a wake-up is already pending) or closed
+
+    @staticmethod
+    def _drain(fd: int) -> None:
+        # Events only matter as a wake-up; discard their payload. One read
+        # is enough: select() is level-triggered, so anything left over
+        # just ends the next wait early, where the queue gets rescanned
+        # anyway. Reading until EAGAIN would cost a syscall per wake-up.
+        try:
+            os.read(fd, 65536)
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        fds = (self._fd, self._wake_r, self._wake_w)
+        self._fd = self._wake_r = self._wake_w = None
+        for fd in fds:
+            if fd is not None:
+                os.close(fd)
 
 
 class BridgeWatcher:
@@ -70,7 +179,10 @@ class BridgeWatcher:
         self.poll_interval = poll_interval
         self.max_workers = max_workers
         self._running = False
+        # Entries are removed by a done-callback on the worker thread
         self._active_tasks: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._notifier: Optional[_DirNotifier] = None
 
     def start(self) -> None:
         """Start the watcher loop. Blocks until stopped."""
@@ -92,24 +204,36 @@ class BridgeWatcher:
         except ValueError:
             pass  # Not in main thread — signals handled externally
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            while self._running:
-                try:
-                    self._poll_cycle(executor)
-                except Exception as e:
-                    _log("💥", f"Poll cycle error: {e}", _C.RED)
-                    traceback.print_exc()
-
-                # Clean up finished futures
-                self._cleanup_futures()
+        # Wake on new pending files where the OS supports it; the poll
+        # interval remains the upper bound between scans either way.
+        notifier = self._notifier = _DirNotifier(self.queue.pending_dir)
+        if notifier.active:
+            _log("⚡", "Using inotify for pending-task wake-ups", _C.DIM)
 
-                time.sleep(self.poll_interval)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                while self._running:
+                    try:
+                        self._poll_cycle(executor)
+                    except Exception as e:
+                        _log("💥", f"Poll cycle error: {e}", _C.RED)
+                        traceback.print_exc()
+
+                    notifier.wait(self.poll_interval)
+        finally:
+            self._notifier = None
+            notifier.close()
+            # Workers are done: persist the moves they made
+            self.queue.flush()
 
         _log("🛑", "Agent Maestro watcher stopped", _C.YELLOW)
 
     def stop(self) -> None:
         """Signal the watcher to stop."""
         self._running = False
+        notifier = self._notifier
+        if notifier is not None:
+            notifier.wake()
 
     def _handle_shutdown(self, signum, frame) -> None:
         _log("", "")
@@ -117,36 +241,40 @@ class BridgeWatcher:
         self.stop()
 
     def _poll_cycle(self, executor: ThreadPoolExecutor) -> None:
-        """Check for pending tasks and dispatch them."""
-        # Don't pick up new tasks if we're at capacity
-        active_count = len(self._active_tasks)
-        if active_count >= self.max_workers:
-            return
+        """
+        Check for pending tasks and dispatch them.
 
-        pending = self.queue.get_pending_tasks()
-        if not pending:
+        Tasks are claimed only for free worker slots, never ahead into a
+        local backlog: whatever isn't running stays PENDING, in priority
+        order, for this or any other watcher to pick up.
+        """
+        # Don't pick up new tasks if we're at capacity
+        with self._lock:
+            slots = self.max_workers - len(self._active_tasks)
+        if slots <= 0:
             return
 
-        # Pick the highest-priority pending task(s) and claim as many as we have capacity for
-        while len(self._active_tasks) < self.max_workers:
-            pending = self.queue.get_pending_tasks()
-            if not pending:
-                break
-
-            task = pending[0]
-            _log("📋", f"Found pending task: {task}", _C.BLUE)
-
+        # One listing per cycle, of just the top `slots` headers: they are
+        # enough to choose, and only the claimed tasks are loaded. A task
+        # claimed elsewhere meanwhile is skipped; its slot fills next cycle.
+        for header in self.queue.get_pending_headers(limit=slots):
+            if header.id in self._active_tasks:
+                # Already dispatched by this watcher; don't claim it twice
+                continue
             try:
-                claimed = self.queue.claim_task(task.id)
+                claimed = self.queue.claim_task(header.id)
+                _log("📋", f"Found pending task: {claimed}", _C.BLUE)
                 _log("🔄", f"Claimed task [{claimed.id}] → RUNNING", _C.YELLOW)
             except ValueError as e:
-                _log("⚠️ ", f"Could not claim task [{task.id}]: {e}", _C.RED)
-                # Try next pending task / iteration
+                _log("⚠️ ", f"Could not claim task [{header.id}]: {e}", _C.RED)
                 continue
 
             # Dispatch to runner in a thread using the claimed (fresh) Task object
             future = executor.submit(self._execute_task, claimed)
-            self._active_tasks[claimed.id] = future
+            with self._lock:
+                self._active_tasks[claimed.id] = future
+            # Outside the lock: runs inline if the task already finished
+            future.add_done_callback(lambda f, tid=claimed.id: self._task_done(tid))
 
     def _execute_task(self, task: Task) -> None:
         """Run a task through the runner and record the result."""
@@ -174,26 +302,29 @@ class BridgeWatcher:
             except Exception:
                 pass  # Best-effort error recording
 
-    def _cleanup_futures(self) -> None:
-        """Remove completed futures from the active set."""
-        done = [tid for tid, f in self._active_tasks.items() if f.done()]
-        for tid in done:
-            del self._active_tasks[tid]
+    def _task_done(self, task_id: str) -> None:
+        """Done-callback (runs on the worker thread): free the task's slot."""
+        with self._lock:
+            self._active_tasks.pop(task_id, None)
+        # The freed slot can take a pending task now, not after the wait
+        notifier = self._notifier
+        if notifier is not None:
+            notifier.wake()
 
 
-def main():
+def main(fail_on_error: bool = False):
     """CLI entry point — start the watcher with default config."""
     from .config import load_config
 
     project_root = str(Path.cwd())
-    config = load_config(project_root)
+    config = load_config(project_root, fail_on_error=fail_on_error)
 
-    bridge_cfg = config.get("bridge", {})
-    runner_cfg = config.get("runners", {})
+    bridge_cfg = config["bridge"]
+    runner_cfg = config["runners"]
 
     # Set up queue
-    queue_dir = Path(project_root) / bridge_cfg.get("agent_bridge_dir", ".agent_bridge")
-    queue = TaskQueue(queue_dir)
+    queue_dir = Path(project_root) / bridge_cfg["agent_bridge_dir"]
+    queue = open_queue(queue_dir, bridge_cfg["backend"], bridge_cfg["fsync_every"])
 
     # Set up runner
     cli_cfg = runner_cfg.get("copilot_cli", {})
@@ -1,17 +1,23 @@
+import os
 import time
+
 import pytest
 
 
 def wait_for_status(predicate, timeout: float = 5.0, interval: float = 0.05) -> bool:
     """Poll until predicate() returns True or timeout (seconds) elapses.
 
-    Raises TimeoutError if the condition isn't met in time.
+    The poll delay starts at 1ms and doubles up to `interval`, so a
+    condition that holds almost at once costs ~1ms rather than a full
+    interval. Raises TimeoutError if the condition isn't met in time.
     """
-    end = time.time() + timeout
-    while time.time() < end:
+    end = time.monotonic() + timeout
+    delay = 0.001
+    while time.monotonic() < end:
         if predicate():
             return True
-        time.sleep(interval)
+        time.sleep(delay)
+        delay = min(delay * 2, interval)
     raise TimeoutError("wait_for_status: condition not met within timeout")
 
 
@@ -23,3 +29,51 @@ def wait_for_status_fn():
         wait_for_status_fn(lambda: some_condition(), timeout=3.0)
     """
     return wait_for_status
+
+
+class _RecordingOs:
+    """
+    Stand-in for a module's `os` global: logs each function called
+    through it as (name, args), then calls the real one, or the given
+    override. Only that module's name is swapped, so the os module
+    itself (and everything else using it, pytest included) is untouched.
+    """
+
+    def __init__(self, overrides):
+        self._overrides = overrides
+        self.log = []
+
+    @property
+    def calls(self):
+        """Names of the functions called, in order."""
+        return [name for name, _ in self.log]
+
+    def args(self, name):
+        """Argument tuples of each call to `name`, in order."""
+        return [args for called, args in self.log if called == name]
+
+    def __getattr__(self, name):
+        attr = self._overrides.get(name) or getattr(os, name)
+        if not callable(attr):
+            return attr
+
+        def record(*args, **kwargs):
+            self.log.append((name, args))
+            return attr(*args, **kwargs)
+        return record
+
+
+@pytest.fixture
+def record_os(monkeypatch):
+    """Fixture: swap a module's `os` for a recorder, undone at teardown.
+
+    Usage:
+        rec = record_os(agent_maestro.queue, urandom=lambda n: b"..." * n)
+        ...
+        assert rec.calls == ["scandir"]
+    """
+    def install(module, **overrides):
+        recorder = _RecordingOs(overrides)
+        monkeypatch.setattr(module, "os", recorder)
+        return recorder
+    return install
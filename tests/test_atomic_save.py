@@ -10,6 +10,8 @@ import time
 import multiprocessing
 from pathlib import Path
 
+import pytest
+
 from agent_maestro.protocol import Task
 
 
@@ -57,4 +59,42 @@ def test_atomic_save(tmp_path):
     assert not tmp_files, f"Found unexpected temporary files: {tmp_files}"
 
     # We should have parsed successfully at least once while writer ran
-    assert parse_success >= 1, "Never observed a parseable JSON while writer ran"
\ No newline at end of file
+    assert parse_success >= 1, "Never observed a parseable JSON while writer ran"
+
+
+def test_failed_save_removes_temp_file(tmp_path):
+    # Target is a directory, so the final os.replace must fail
+    target = tmp_path / "task_dir.json"
+    target.mkdir()
+    (target / "keep").write_text("x", encoding="utf-8")
+
+    with pytest.raises(OSError):
+        Task(instructions="will not land").save(target)
+
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_save_uses_raw_fd_io_and_a_sibling_temp(tmp_path, monkeypatch):
+    import os
+    import types
+
+    import agent_maestro.protocol as protocol
+
+    # Spy through protocol's own `os` name; the os module itself is untouched
+    calls = []
+
+    def spy(name):
+        real = getattr(os, name)
+        return lambda *args: calls.append((name, args)) or real(*args)
+
+    spies = {name: spy(name) for name in ("open", "write", "replace")}
+    monkeypatch.setattr(protocol, "os", types.SimpleNamespace(**{**vars(os), **spies}))
+
+    target = tmp_path / "task_raw.json"
+    Task(instructions="raw").save(target)
+
+    assert [name for name, _ in calls] == ["open", "write", "replace"]
+    tmp = calls[0][1][0]
+    assert os.path.dirname(tmp) == str(tmp_path)
+    assert calls[2][1] == (tmp, target)
+    assert Task.from_file(target).instructions == "raw"
@@ -0,0 +1,51 @@
+"""
+Tests for agent_maestro.cli — argument parsing and command dispatch.
+"""
+
+import pytest
+
+from agent_maestro import cli
+from agent_maestro.queue import TaskQueue
+
+
+class TestCommandLookup:
+    def test_finds_command_after_project_root(self):
+        assert cli._find_command(["-p", "status", "list"]) == "list"
+        assert cli._find_command(["--project-root=x", "stats"]) == "stats"
+
+    def test_help_before_command_builds_full_parser(self):
+        assert cli._find_command(["-h", "status"]) is None
+        assert cli._find_command([]) is None
+
+    def test_only_dispatched_subparser_is_registered(self):
+        args = cli._build_parser("status").parse_args(["status", "abc123"])
+        assert args.func is cli.cmd_status
+        assert args.task_id == "abc123"
+
+
+class TestDispatch:
+    def test_stats(self, tmp_path, capsys):
+        q = TaskQueue(tmp_path / ".agent_bridge")
+        q.create_task(instructions="Count me")
+
+        cli.main(["-p", str(tmp_path), "stats"])
+
+        out = capsys.readouterr().out
+        assert "Pending:   1" in out
+
+    def test_unknown_command_exits(self, capsys):
+        with pytest.raises(SystemExit):
+            cli.main(["bogus"])
+
+    def test_list_rejects_invalid_status(self, tmp_path, capsys):
+        with pytest.raises(SystemExit):
+            cli.main(["-p", str(tmp_path), "list", "--status", "nope"])
+        assert "invalid choice" in capsys.readouterr().err
+
+    def test_list_status_is_case_insensitive(self, tmp_path, capsys):
+        q = TaskQueue(tmp_path / ".agent_bridge")
+        q.create_task(instructions="Still pending")
+
+        cli.main(["-p", str(tmp_path), "list", "--status", "pending"])
+
+        assert "Still pending" in capsys.readouterr().out
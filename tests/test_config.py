@@ -46,3 +46,63 @@ def test_runner_default_normalization(tmp_path):
 
     cfg = load_config(tmp_path)
     assert cfg["runners"]["default"] == "copilot_cli"
+
+
+def test_config_cached_until_file_changes(tmp_path):
+    load_config.cache_clear()
+    cfg_file = tmp_path / "config.yaml"
+    write_config(cfg_file, """
+    bridge:
+      poll_interval_seconds: 5
+    """)
+
+    first = load_config(tmp_path)
+    first["bridge"]["poll_interval_seconds"] = 99  # must not poison the cache
+    assert load_config(tmp_path)["bridge"]["poll_interval_seconds"] == 5
+
+    write_config(cfg_file, """
+    bridge:
+      poll_interval_seconds: 12
+    """)
+    assert load_config(tmp_path)["bridge"]["poll_interval_seconds"] == 12
+
+
+def test_invalid_value_raises_unless_fail_on_error(tmp_path):
+    cfg_file = tmp_path / "config.yaml"
+    write_config(cfg_file, """
+    bridge:
+      poll_interval_seconds: soon
+    """)
+
+    with pytest.raises(ValueError, match="poll_interval_seconds"):
+        load_config(tmp_path)
+    with pytest.raises(SystemExit):
+        load_config(tmp_path, fail_on_error=True)
+
+
+def test_nested_override_keeps_sibling_defaults(tmp_path):
+    cfg_file = tmp_path / "config.yaml"
+    write_config(cfg_file, """
+    runners:
+      copilot_cli:
+        model: gpt-5
+    """)
+
+    cfg = load_config(tmp_path)
+    assert cfg["runners"]["copilot_cli"]["model"] == "gpt-5"
+    assert cfg["runners"]["copilot_cli"]["command"] == "copilot"
+    assert cfg["bridge"]["poll_interval_seconds"] == 3
+
+
+def test_load_config_does_not_walk_the_stack(tmp_path, monkeypatch):
+    import inspect
+
+    def no_stack(*args, **kwargs):
+        raise AssertionError("load_config must not call inspect.stack()")
+
+    monkeypatch.setattr(inspect, "stack", no_stack)
+    write_config(tmp_path / "config.yaml", """
+    bridge:
+      max_concurrent_tasks: 2
+    """)
+    assert load_config(tmp_path)["bridge"]["max_concurrent_tasks"] == 2
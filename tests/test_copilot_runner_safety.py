@@ -1,7 +1,12 @@
+import io
+import os
 import tempfile
 import subprocess
 import shutil
 from pathlib import Path
+
+import pytest
+
 from agent_maestro.runners.copilot_runner import CopilotRunner
 from agent_maestro.protocol import Task
 
@@ -19,19 +24,15 @@ def test_no_mktemp_and_uses_argv(monkeypatch, tmp_path):
     captured = {}
 
     class DummyPopen:
-        def __init__(self, cmd, stdout, stderr, cwd=None):
+        def __init__(self, cmd, stdout, stderr, cwd=None, **kwargs):
             # capture the cmd for assertions
             captured['cmd'] = cmd
             # ensure we received a list and not a single PowerShell -Command string
             assert isinstance(cmd, list)
             flat = " ".join(str(x) for x in cmd).lower()
             assert 'powershell' not in flat
-            # write output to the file-like stdout
-            try:
-                stdout.write(b"ok\n")
-                stdout.flush()
-            except Exception:
-                pass
+            # output is read back from the stdout pipe
+            self.stdout = io.BytesIO(b"ok\n")
             self.returncode = 0
 
         def wait(self, timeout=None):
@@ -55,14 +56,10 @@ def test_extra_args_sanitization(monkeypatch, tmp_path):
     seen_cmd = {}
 
     class DummyPopen2:
-        def __init__(self, cmd, stdout, stderr, cwd=None):
+        def __init__(self, cmd, stdout, stderr, cwd=None, **kwargs):
             seen_cmd['cmd'] = cmd
             self.returncode = 0
-            try:
-                stdout.write(b"ok2\n")
-                stdout.flush()
-            except Exception:
-                pass
+            self.stdout = io.BytesIO(b"ok2\n")
 
         def wait(self, timeout=None):
             return 0
@@ -80,3 +77,203 @@ def test_extra_args_sanitization(monkeypatch, tmp_path):
     res2 = runner2.execute(task, project_root=str(tmp_path))
     assert not res2.success
     assert 'Invalid extra arg' in res2.error
+
+
+@pytest.mark.skipif(os.name != "posix", reason="prompt fd is POSIX-only")
+@pytest.mark.parametrize("use_memfd", [True, False])
+def test_prompt_is_delivered_through_fd(tmp_path, monkeypatch, use_memfd):
+    from agent_maestro.runners import copilot_runner
+
+    if use_memfd and not hasattr(os, "memfd_create"):
+        pytest.skip("memfd_create unavailable")
+    monkeypatch.setattr(copilot_runner, "_PROMPT_VIA_MEMFD", use_memfd)
+    temp_files = []
+    monkeypatch.setattr(CopilotRunner, "_write_prompt_file", staticmethod(temp_files.append))
+
+    # Fake copilot that echoes the file named by its last argument (-p <path>)
+    script = tmp_path / "copilot"
+    script.write_text('#!/bin/sh\nfor last; do :; done\ncat "$last"\n', encoding="utf-8")
+    script.chmod(0o755)
+
+    runner = CopilotRunner(copilot_command=str(script))
+    task = Task(instructions="Read me", context="x" * 200_000)
+    res = runner.execute(task, project_root=str(tmp_path))
+    assert res.success, res.error
+    assert "TASK: Read me" in res.output
+    assert temp_files == []  # the temp-file fallback was never taken
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses a shell script as fake copilot")
+def test_output_keeps_only_the_tail(tmp_path):
+    script = tmp_path / "copilot"
+    script.write_text(
+        "#!/bin/sh\nhead -c 600000 /dev/zero | tr '\\0' a\necho END-OF-OUTPUT\n",
+        encoding="utf-8",
+    )
+    script.chmod(0o755)
+
+    res = CopilotRunner(copilot_command=str(script)).execute(
+        Task(instructions="Talk a lot"), project_root=str(tmp_path)
+    )
+    assert res.success, res.error
+    assert res.output.endswith("END-OF-OUTPUT")
+    assert len(res.output) <= 256 * 1024
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses a shell script as fake copilot")
+def test_moved_executable_is_looked_up_again(tmp_path, monkeypatch):
+    old_dir, new_dir = tmp_path / "old", tmp_path / "new"
+    for d in (old_dir, new_dir):
+        d.mkdir()
+        script = d / "copilot"
+        script.write_text(f"#!/bin/sh\necho from {d.name}\n", encoding="utf-8")
+        script.chmod(0o755)
+    monkeypatch.setenv("PATH", str(old_dir))
+    runner = CopilotRunner()
+    task = Task(instructions="Move me")
+    assert runner.execute(task, project_root=str(tmp_path)).output == "from old"
+
+    # CLI reinstalled elsewhere: the cached path is gone
+    (old_dir / "copilot").unlink()
+    monkeypatch.setenv("PATH", str(new_dir))
+    res = runner.execute(task, project_root=str(tmp_path))
+    assert res.success, res.error
+    assert res.output == "from new"
+    assert runner._resolved_exe == ("copilot", str(new_dir / "copilot"))
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses a shell script as fake copilot")
+def test_timeout_reaps_the_child_and_closes_its_pipe(tmp_path, monkeypatch):
+    import types
+    from agent_maestro.runners import copilot_runner
+
+    started = []
+
+    class RecordingPopen(subprocess.Popen):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            started.append(self)
+
+    # Swap Popen for the runner module only, not process-wide
+    monkeypatch.setattr(
+        copilot_runner, "subprocess", types.SimpleNamespace(**{**vars(subprocess), "Popen": RecordingPopen})
+    )
+    script = tmp_path / "copilot"
+    script.write_text("#!/bin/sh\necho partial progress\nexec sleep 30\n", encoding="utf-8")
+    script.chmod(0o755)
+
+    res = CopilotRunner(copilot_command=str(script), timeout_seconds=1).execute(
+        Task(instructions="Hang"), project_root=str(tmp_path)
+    )
+    assert not res.success
+    assert "timed out" in res.error
+    assert res.output == "partial progress"
+    (proc,) = started
+    assert proc.returncode is not None
+    assert proc.stdout.closed
+
+
+@pytest.mark.skipif(os.name != "posix", reason="needs symlinks")
+def test_validate_target_files_follows_symlinks(tmp_path):
+    root = tmp_path / "project"
+    (root / "src").mkdir(parents=True)
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (root / "src" / "a.py").write_text("", encoding="utf-8")
+    (root / "src" / "alias.py").symlink_to(root / "src" / "a.py")
+    (root / "src" / "escape.py").symlink_to(outside / "secret.py")
+    (root / "linkdir").symlink_to(outside)
+
+    runner = CopilotRunner()
+    assert runner.validate_target_files(
+        ["src/a.py", "src/alias.py", "src/new.py"], str(root)
+    ) == [os.path.join("src", "a.py"), os.path.join("src", "a.py"), os.path.join("src", "new.py")]
+    for bad in ("src/escape.py", "linkdir/x.py"):
+        with pytest.raises(ValueError, match="escapes project root"):
+            runner.validate_target_files(["src/a.py", bad], str(root))
+
+
+def test_executable_lookup_is_cached(monkeypatch):
+    lookups = []
+
+    def which(cmd):
+        lookups.append(cmd)
+        return f"/usr/bin/{cmd}" if cmd != "missing" else None
+
+    monkeypatch.setattr(shutil, "which", which)
+    runner = CopilotRunner(copilot_command="copilot")
+    assert runner._resolve_executable() == "/usr/bin/copilot"
+    assert runner._resolve_executable() == "/usr/bin/copilot"
+    assert lookups == ["copilot"]
+
+    runner.copilot_command = "missing"
+    assert runner._resolve_executable() is None
+    assert runner._resolve_executable() is None
+    assert lookups == ["copilot", "missing", "missing"]
+
+
+@pytest.mark.parametrize("module", ["base", "copilot_runner"])
+def test_runner_modules_define_each_class_once(module):
+    import ast
+    import importlib
+
+    mod = importlib.import_module(f"agent_maestro.runners.{module}")
+    tree = ast.parse(Path(mod.__file__).read_text(encoding="utf-8"))
+    names = [node.name for node in tree.body if isinstance(node, ast.ClassDef)]
+    assert len(names) == len(set(names))
+
+
+class _ReadOnlyStream:
+    def __init__(self, data):
+        self._io = io.BytesIO(data)
+
+    def read(self, n):
+        return self._io.read(n)
+
+
+@pytest.mark.parametrize("wrap", [io.BytesIO, _ReadOnlyStream])
+def test_tail_buffer_keeps_last_bytes(wrap):
+    from agent_maestro.runners.copilot_runner import _TailBuffer
+
+    data = b"".join(b"line %d\n" % i for i in range(50000)) + "done ✓".encode()
+    tail = _TailBuffer(1000)
+    tail.drain(wrap(data))
+    assert tail.getvalue() == data[-1000:]
+    assert tail.text() == data[-1000:].decode()
+
+
+def test_build_prompt_project_root_is_optional():
+    assert CopilotRunner().build_prompt(Task(instructions="Do it")) == "TASK: Do it"
+
+
+def test_build_prompt_shapes():
+    runner = CopilotRunner()
+    assert runner.build_prompt(Task(instructions="Do it"), ".") == "TASK: Do it"
+    full = Task(instructions="Do it", agent_type="tester", target_files=["a.py"], context="ctx")
+    prompt = runner.build_prompt(full, ".")
+    assert prompt.startswith("You are writing tests.")
+    assert prompt.endswith(" --- TASK: Do it Files: a.py Context: ctx")
+    unknown_role = Task(instructions="Do it", agent_type="nobody", target_files=["a.py", "b.py"])
+    assert runner.build_prompt(unknown_role, ".") == "TASK: Do it Files: a.py, b.py"
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses a shell script as fake copilot")
+def test_runner_never_fsyncs(tmp_path, monkeypatch, record_os):
+    from agent_maestro.runners import copilot_runner
+
+    recorder = record_os(copilot_runner)
+    # Exercise the temp-file fallback used where /dev/fd isn't available
+    monkeypatch.setattr(copilot_runner, "_PROMPT_VIA_FD", False)
+    monkeypatch.setattr(copilot_runner, "_PROMPT_VIA_MEMFD", False)
+    script = tmp_path / "copilot"
+    script.write_text('#!/bin/sh\nfor last; do :; done\ncat "$last"\n', encoding="utf-8")
+    script.chmod(0o755)
+
+    res = CopilotRunner(copilot_command=str(script)).execute(
+        Task(instructions="No fsync"), project_root=str(tmp_path)
+    )
+    assert res.success, res.error
+    assert "TASK: No fsync" in res.output
+    # Ephemeral runner files are never fsynced
+    assert "fsync" not in recorder.calls
+    assert "chmod" in recorder.calls  # the temp-file path did go through this os
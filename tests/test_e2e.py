@@ -53,7 +53,7 @@ def setup(tmp_path):
 
 
 class TestEndToEnd:
-    def test_task_completes_via_watcher(self, setup):
+    def test_task_completes_via_watcher(self, setup, wait_for_status_fn):
         queue, runner, watcher = setup
 
         task = queue.create_task(
@@ -64,11 +64,7 @@ class TestEndToEnd:
         thread = threading.Thread(target=watcher.start, daemon=True)
         thread.start()
 
-        for _ in range(50):
-            result = queue.get_task(task.id)
-            if result and result.status == TaskStatus.COMPLETED:
-                break
-            time.sleep(0.1)
+        wait_for_status_fn(lambda: (queue.get_task(task.id) or task).status == TaskStatus.COMPLETED)
 
         watcher.stop()
         thread.join(timeout=3)
@@ -79,7 +75,7 @@ class TestEndToEnd:
         assert "Mock completed" in final.result
         assert task.id in runner.executed_tasks
 
-    def test_failed_task_recorded(self, tmp_path):
+    def test_failed_task_recorded(self, tmp_path, wait_for_status_fn):
         queue = TaskQueue(tmp_path / ".agent_bridge")
         runner = MockRunner(delay=0.05, should_fail=True)
         watcher = BridgeWatcher(
@@ -94,11 +90,7 @@ class TestEndToEnd:
         thread = threading.Thread(target=watcher.start, daemon=True)
         thread.start()
 
-        for _ in range(50):
-            result = queue.get_task(task.id)
-            if result and result.status == TaskStatus.FAILED:
-                break
-            time.sleep(0.1)
+        wait_for_status_fn(lambda: (queue.get_task(task.id) or task).status == TaskStatus.FAILED)
 
         watcher.stop()
         thread.join(timeout=3)
@@ -108,7 +100,7 @@ class TestEndToEnd:
         assert final.status == TaskStatus.FAILED
         assert "Mock failure" in final.error
 
-    def test_priority_ordering_processed_first(self, setup):
+    def test_priority_ordering_processed_first(self, setup, wait_for_status_fn):
         queue, runner, watcher = setup
 
         low = queue.create_task(instructions="Low priority work", priority=0)
@@ -117,11 +109,7 @@ class TestEndToEnd:
         thread = threading.Thread(target=watcher.start, daemon=True)
         thread.start()
 
-        for _ in range(100):
-            tasks = queue.list_tasks(status=TaskStatus.COMPLETED)
-            if len(tasks) >= 2:
-                break
-            time.sleep(0.1)
+        wait_for_status_fn(lambda: len(queue.list_tasks(status=TaskStatus.COMPLETED)) >= 2, timeout=10)
 
         watcher.stop()
         thread.join(timeout=3)
@@ -129,7 +117,7 @@ class TestEndToEnd:
         assert runner.executed_tasks[0] == high.id
         assert runner.executed_tasks[1] == low.id
 
-    def test_task_with_agent_type(self, setup):
+    def test_task_with_agent_type(self, setup, wait_for_status_fn):
         """Verify agent_type is preserved through the full lifecycle."""
         queue, runner, watcher = setup
 
@@ -141,11 +129,7 @@ class TestEndToEnd:
         thread = threading.Thread(target=watcher.start, daemon=True)
         thread.start()
 
-        for _ in range(50):
-            result = queue.get_task(task.id)
-            if result and result.status == TaskStatus.COMPLETED:
-                break
-            time.sleep(0.1)
+        wait_for_status_fn(lambda: (queue.get_task(task.id) or task).status == TaskStatus.COMPLETED)
 
         watcher.stop()
         thread.join(timeout=3)
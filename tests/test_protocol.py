@@ -6,6 +6,8 @@ import json
 import tempfile
 from pathlib import Path
 
+import pytest
+
 from agent_maestro.protocol import Task, TaskStatus, TaskAction, RunResult
 
 
@@ -153,3 +155,119 @@ class TestRunResult:
         r = RunResult(success=False, error="Timeout")
         assert r.success is False
         assert r.error == "Timeout"
+
+
+def test_to_dict_covers_every_field():
+    from dataclasses import fields
+
+    task = Task(instructions="Check fields", target_files=["a.py"])
+    d = task.to_dict()
+    assert list(d) == [f.name for f in fields(Task)]
+    d["target_files"].append("b.py")
+    assert task.target_files == ["a.py"]
+
+
+def test_from_dict_ignores_unknown_keys():
+    data = Task(instructions="Newer writer").to_dict()
+    data["attempts"] = 3
+    restored = Task.from_dict(data)
+    assert restored.instructions == "Newer writer"
+    assert not hasattr(restored, "attempts")
+
+
+def test_dict_roundtrip_preserves_every_field():
+    task = Task(
+        instructions="All fields",
+        agent="copilot",
+        agent_type="reviewer",
+        action="review",
+        target_files=["a.py", "b.py"],
+        status=TaskStatus.FAILED,
+        context="ctx",
+        result="partial",
+        error="boom",
+        completed_at="2026-01-02T00:00:00+00:00",
+        priority=7,
+    )
+    assert Task.from_dict(task.to_dict()) == task
+
+
+def test_from_dict_rejects_unknown_status():
+    data = Task(instructions="Bad status").to_dict()
+    data["status"] = "PAUSED"
+    with pytest.raises(ValueError):
+        Task.from_dict(data)
+
+
+def test_status_string_is_coerced_on_construction():
+    task = Task(instructions="Coerce", status="RUNNING")
+    assert task.status is TaskStatus.RUNNING
+    assert task.to_dict()["status"] == "RUNNING"
+
+
+def test_task_has_no_instance_dict():
+    task = Task(instructions="Slots")
+    assert not hasattr(task, "__dict__")
+    with pytest.raises(AttributeError):
+        task.attempts = 3
+
+
+def test_protocol_defines_each_class_once():
+    import ast
+    import agent_maestro.protocol as protocol
+
+    tree = ast.parse(Path(protocol.__file__).read_text(encoding="utf-8"))
+    names = [node.name for node in tree.body if isinstance(node, ast.ClassDef)]
+    assert len(names) == len(set(names))
+
+
+def test_timestamps_match_isoformat(monkeypatch):
+    from datetime import datetime, timedelta, timezone
+    import agent_maestro.protocol as protocol
+
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    for ns in (1_760_000_000_123_456_789, 1_760_000_001_000_000_000):
+        monkeypatch.setattr(protocol.time, "time_ns", lambda ns=ns: ns)
+        expected = (epoch + timedelta(microseconds=ns // 1000)).isoformat()
+        assert protocol._utc_now() == expected
+
+
+def test_from_file_tolerates_stale_size_hint(tmp_path):
+    path = tmp_path / "task.json"
+    task = Task(instructions="Sized read", context="x" * 5000)
+    task.save(path)
+    size = path.stat().st_size
+    for hint in (-1, 0, size // 2, size, size * 2):
+        assert Task.from_file(path, hint) == task
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_to_bytes_matches_json_dumps(monkeypatch, use_orjson):
+    # Task files must be byte-identical with or without the [fast] extra
+    import agent_maestro.protocol as protocol
+
+    monkeypatch.setattr(protocol, "orjson", pytest.importorskip("orjson") if use_orjson else None)
+    tasks = [
+        Task(instructions="plain"),
+        Task(instructions='quotes " and \\ and é and  ', target_files=["a b.py", "ü.py"]),
+        Task(instructions="long\n" * 200, context="ctx\t" * 200, result="ok", priority=-2),
+    ]
+    for task in tasks:
+        expected = json.dumps(task.to_dict(), indent=2, ensure_ascii=False).encode("utf-8")
+        assert task.to_bytes() == expected
+        assert task.to_bytes() == expected  # second call served from the escape cache
+        assert Task.from_json(expected) == task
+
+
+@pytest.mark.parametrize("native", [True, False])
+def test_exclusive_save_never_replaces(tmp_path, monkeypatch, native):
+    import agent_maestro.protocol as protocol
+
+    if not native:
+        monkeypatch.setattr(protocol, "_renameat2", lambda: None)
+    path = tmp_path / "task.json"
+    Task(instructions="first").save(path, exclusive=True)
+    with pytest.raises(FileExistsError):
+        Task(instructions="second").save(path, exclusive=True)
+    assert Task.from_file(path).instructions == "first"
+    assert [p.name for p in tmp_path.iterdir()] == ["task.json"]
@@ -2,7 +2,9 @@
 Tests for agent_maestro.queue — File-based task queue operations.
 """
 
+import os
 import tempfile
+import threading
 from pathlib import Path
 
 import pytest
@@ -13,10 +15,17 @@ from agent_maestro.queue import TaskQueue
 
 @pytest.fixture
 def queue(tmp_path):
-    """Create a TaskQueue in a temporary directory."""
+    """
+    Create a TaskQueue in a temporary directory.
+
+    Deliberately one per test: a queue carries in-memory state (pending
+    index, parse cache, location hints) that file rollback wouldn't reset,
+    and setting one up costs well under a millisecond.
+    """
     return TaskQueue(tmp_path / ".agent_bridge")
 
 
+
 class TestQueueCreation:
     def test_creates_subdirectories(self, queue):
         assert (queue.root / "pending").is_dir()
@@ -24,6 +33,19 @@ class TestQueueCreation:
         assert (queue.root / "completed").is_dir()
         assert (queue.root / "failed").is_dir()
 
+    def test_reopening_only_creates_missing_dirs(self, queue, monkeypatch):
+        (queue.root / "failed").rmdir()
+        made = []
+        monkeypatch.setattr(Path, "mkdir", lambda self, *a, **k: made.append(self.name))
+        TaskQueue(queue.root)
+        assert made == ["failed"]
+
+    def test_status_path_taken_by_a_file_raises(self, tmp_path):
+        (tmp_path / "q").mkdir()
+        (tmp_path / "q" / "running").write_text("not a dir", encoding="utf-8")
+        with pytest.raises(FileExistsError):
+            TaskQueue(tmp_path / "q")
+
     def test_create_task(self, queue):
         task = queue.create_task(
             instructions="Write tests",
@@ -44,6 +66,51 @@ class TestQueueCreation:
         assert task.agent == "copilot"
         assert task.priority == 3
 
+    def test_create_task_never_overwrites_on_id_clash(self, queue, record_os):
+        import agent_maestro.protocol as protocol
+
+        ids = iter([b"\x00" * 4, b"\x00" * 4, b"\x01" * 4])
+        record_os(protocol, urandom=lambda n: next(ids) if n == 4 else os.urandom(n))
+
+        first = queue.create_task(instructions="First")
+        second = queue.create_task(instructions="Second")
+        assert first.id == "00000000"
+        assert second.id == "01010101"
+        assert queue.get_task(first.id).instructions == "First"
+        assert queue.get_task(second.id).instructions == "Second"
+
+    def test_create_tasks(self, queue):
+        tasks = queue.create_tasks(
+            [{"instructions": "A", "priority": 2, "target_files": ["a.py"]}, {"instructions": "B"}]
+        )
+        assert [t.instructions for t in tasks] == ["A", "B"]
+        assert len({t.id for t in tasks}) == 2
+        for task in tasks:
+            assert queue.get_task(task.id) == task
+        assert sorted(p.name for p in (queue.root / "pending").iterdir()) == sorted(t.filename for t in tasks)
+        assert queue.create_tasks([]) == []
+
+    def test_create_tasks_never_overwrites_on_id_clash(self, queue, record_os):
+        import agent_maestro.protocol as protocol
+
+        ids = iter([b"\x00" * 4, b"\x00" * 4, b"\x01" * 4])
+        record_os(protocol, urandom=lambda n: next(ids) if n == 4 else os.urandom(n))
+
+        first = queue.create_task(instructions="First")
+        (second,) = queue.create_tasks([{"instructions": "Second"}])
+        assert second.id == "01010101"
+        assert queue.get_task(first.id).instructions == "First"
+        assert queue.get_task(second.id).instructions == "Second"
+        assert len(list((queue.root / "pending").iterdir())) == 2
+
+    def test_create_tasks_writes_the_batch_before_fsyncing(self, queue, record_os):
+        import agent_maestro.protocol as protocol
+
+        recorder = record_os(protocol)
+        queue.create_tasks([{"instructions": f"T{i}"} for i in range(3)])
+        calls = [name for name in recorder.calls if name in ("write", "fsync")]
+        assert calls == ["write"] * 3 + ["fsync"] * 3
+
     def test_create_task_with_agent_type(self, queue):
         task = queue.create_task(
             instructions="Implement feature",
@@ -77,6 +144,47 @@ class TestQueueOperations:
         with pytest.raises(ValueError, match="expected PENDING"):
             queue.claim_task(task.id)
 
+    def test_claim_never_overwrites_a_running_task(self, queue, caplog):
+        running = queue.create_task(instructions="Running")
+        queue.claim_task(running.id)
+        # A pending file with the same id, e.g. dropped in by another tool
+        clash = Task(id=running.id, instructions="Clash")
+        clash.save(queue.root / "pending" / clash.filename)
+
+        with pytest.raises(ValueError, match="already has a file in running"):
+            queue.claim_task(running.id)
+        assert f"Claim of {running.id} blocked" in caplog.text
+        assert Task.from_file(queue.root / "running" / running.filename).instructions == "Running"
+        assert (queue.root / "pending" / clash.filename).exists()
+
+    def test_concurrent_claim_single_winner(self, queue):
+        task = queue.create_task(instructions="race")
+        # One queue per claimer, like separate watcher processes
+        claimers = [TaskQueue(queue.root) for _ in range(8)]
+        start = threading.Barrier(len(claimers))
+        results = []
+
+        def claim(q):
+            start.wait()
+            try:
+                q.claim_task(task.id)
+                results.append("ok")
+            except ValueError:
+                results.append("already")
+
+        threads = [threading.Thread(target=claim, args=(q,)) for q in claimers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sorted(results) == ["already"] * 7 + ["ok"]
+        assert [p.name for p in (queue.root / "running").iterdir()] == [task.filename]
+        assert not list((queue.root / "pending").iterdir())
+
+    def test_claim_unknown_task_raises(self, queue):
+        with pytest.raises(ValueError, match="not found"):
+            queue.claim_task("nonexistent")
+
     def test_complete_task(self, queue):
         task = queue.create_task(instructions="Test")
         queue.claim_task(task.id)
@@ -124,6 +232,17 @@ class TestQueueQueries:
         assert pending[0].priority == 10
         assert pending[1].priority == 5
         assert pending[2].priority == 0
+        assert [t.id for t in queue.get_pending_tasks(limit=2)] == [t.id for t in pending[:2]]
+
+    def test_list_tasks_orders_by_priority_then_age(self, queue):
+        a = queue.create_task(instructions="A", priority=1)
+        b = queue.create_task(instructions="B", priority=5)
+        c = queue.create_task(instructions="C", priority=1)
+        queue.claim_task(c.id)
+
+        assert [t.id for t in queue.list_tasks()] == [b.id, a.id, c.id]
+        unsorted = queue.list_tasks(sort=False)
+        assert sorted(t.id for t in unsorted) == sorted([a.id, b.id, c.id])
 
     def test_stats(self, queue):
         queue.create_task(instructions="P1")
@@ -137,6 +256,29 @@ class TestQueueQueries:
         assert stats["COMPLETED"] == 0
         assert stats["FAILED"] == 0
 
+    def test_stats_counts_entries_without_opening_files(self, queue, monkeypatch):
+        queue.create_task(instructions="P1")
+        (queue.root / "pending" / ".task_x.123.0.tmp").write_bytes(b"{")
+        (queue.root / "pending" / "notes.txt").write_text("x", encoding="utf-8")
+
+        def no_reads(*args, **kwargs):
+            raise AssertionError("stats() must not open task files")
+
+        monkeypatch.setattr(Task, "from_file", classmethod(no_reads))
+        assert queue.stats()["PENDING"] == 1
+
+    def test_stats_lists_each_status_dir_once(self, queue, record_os):
+        import agent_maestro.queue as queue_mod
+
+        for i in range(20):
+            queue.create_task(instructions=f"P{i}")
+        recorder = record_os(queue_mod)
+
+        stats = queue.stats()
+        assert stats["PENDING"] == 20
+        # One listing per status dir and nothing else: no stat per entry
+        assert recorder.calls == ["scandir"] * len(stats)
+
 
 class TestQueueCleanup:
     def test_clear_completed(self, queue):
@@ -154,3 +296,276 @@ class TestQueueCleanup:
 
         assert queue.clear_failed() == 1
         assert queue.stats()["FAILED"] == 0
+
+    def test_clear_leaves_non_task_files(self, queue):
+        t = queue.create_task(instructions="Test")
+        queue.claim_task(t.id)
+        queue.complete_task(t.id, "Done")
+        notes = queue.root / "completed" / "notes.txt"
+        notes.write_text("keep", encoding="utf-8")
+
+        assert len(queue.list_tasks(status=TaskStatus.COMPLETED)) == 1
+        assert queue.clear_completed() == 1
+        assert notes.exists()
+        assert queue.list_tasks(status=TaskStatus.COMPLETED) == []
+
+    def test_clear_only_unlinks(self, queue, record_os):
+        import agent_maestro.queue as queue_mod
+
+        for i in range(5):
+            t = queue.create_task(instructions=f"T{i}")
+            queue.claim_task(t.id)
+            queue.fail_task(t.id, "Error")
+        recorder = record_os(queue_mod)
+
+        assert queue.clear_failed() == 5
+        # A listing, then unlinks: entries aren't stat()ed before removal
+        assert recorder.calls == ["listdir"] + ["unlink"] * 5
+        assert not os.listdir(queue.root / "failed")
+
+
+class TestQueueDurability:
+    def test_claim_fsyncs_every_nth_write(self, tmp_path, record_os):
+        import agent_maestro.protocol as protocol
+
+        q = TaskQueue(tmp_path / ".agent_bridge", fsync_every=2)
+        tasks = [q.create_task(instructions=f"T{i}") for i in range(4)]
+
+        recorder = record_os(protocol)
+        for t in tasks:
+            q.claim_task(t.id)
+        assert recorder.calls.count("fsync") == 2
+
+        recorder = record_os(protocol)
+        q.complete_task(tasks[0].id, "done")
+        assert recorder.calls.count("fsync") == 1
+
+    def test_flush_fsyncs_each_changed_dir_once(self, queue, record_os):
+        import agent_maestro.queue as queue_mod
+
+        a = queue.create_task(instructions="A")
+        queue.create_task(instructions="B")
+        queue.claim_task(a.id)
+        queue.complete_task(a.id, "done")
+
+        recorder = record_os(queue_mod)
+        queue.flush()
+        opened = [args[0] for args in recorder.args("open")]
+        assert sorted(os.path.basename(os.path.dirname(p)) for p in opened) == ["completed", "pending", "running"]
+        assert recorder.calls.count("fsync") == 3
+
+        recorder = record_os(queue_mod)
+        queue.flush()
+        assert recorder.calls == []
+
+
+class TestLocationHints:
+    def test_known_task_found_with_one_stat(self, queue, record_os):
+        import agent_maestro.queue as queue_mod
+
+        task = queue.create_task(instructions="A")
+        queue.claim_task(task.id)
+
+        recorder = record_os(queue_mod)
+        assert queue.get_task(task.id).status == TaskStatus.RUNNING
+        assert recorder.args("stat") == [(str(queue.root / "running" / task.filename),)]
+
+    def test_transition_locates_the_task_once(self, queue, monkeypatch):
+        task = queue.create_task(instructions="A")
+        queue.claim_task(task.id)
+        lookups = []
+        real = queue._locate
+        monkeypatch.setattr(queue, "_locate", lambda tid: lookups.append(tid) or real(tid))
+
+        queue.complete_task(task.id, "done")
+        assert lookups == [task.id]
+        assert (queue.root / "completed" / task.filename).exists()
+
+    def test_task_moved_by_other_instance_is_found(self, queue):
+        task = queue.create_task(instructions="A")
+        TaskQueue(queue.root).claim_task(task.id)
+        assert queue.get_task(task.id).status == TaskStatus.RUNNING
+        queue.complete_task(task.id, "done")
+        assert queue.get_task(task.id).status == TaskStatus.COMPLETED
+
+    def test_finished_tasks_drop_their_hint(self, queue):
+        done = queue.create_task(instructions="A")
+        failed = queue.create_task(instructions="B")
+        live = queue.create_task(instructions="C")
+        for task in (done, failed, live):
+            queue.claim_task(task.id)
+        queue.complete_task(done.id, "ok")
+        queue.fail_task(failed.id, "boom")
+
+        assert queue.get_task(done.id).status == TaskStatus.COMPLETED
+        assert queue.get_task(failed.id).status == TaskStatus.FAILED
+        assert queue._locations == {live.id: TaskStatus.RUNNING}
+
+
+class TestPendingIndex:
+    def test_pending_files_parsed_once(self, queue, monkeypatch):
+        queue.create_task(instructions="A", priority=1)
+        queue.create_task(instructions="B", priority=2)
+        assert [t.instructions for t in queue.get_pending_tasks()] == ["B", "A"]
+
+        loads = []
+        real = Task.from_file
+        monkeypatch.setattr(Task, "from_file", classmethod(lambda cls, p, *a: loads.append(p) or real(p, *a)))
+
+        c = queue.create_task(instructions="C", priority=3)
+        pending = queue.get_pending_tasks()
+        assert [t.instructions for t in pending] == ["C", "B", "A"]
+        assert len(loads) == 1
+
+        queue.claim_task(c.id)
+        assert [t.instructions for t in queue.get_pending_tasks()] == ["B", "A"]
+
+    def test_pending_headers_follow_pick_order(self, queue):
+        low = queue.create_task(instructions="A", priority=0)
+        high = queue.create_task(instructions="B", priority=5)
+        headers = queue.get_pending_headers()
+        assert [h.id for h in headers] == [high.id, low.id]
+        assert headers[0].priority == 5
+        assert headers[0].created_at == high.created_at
+
+    def test_pending_headers_limit_returns_top_in_pick_order(self, queue):
+        tasks = [queue.create_task(instructions=f"T{i}", priority=i % 3) for i in range(6)]
+        full = queue.get_pending_headers()
+        assert queue.get_pending_headers(limit=2) == full[:2]
+        assert queue.get_pending_headers(limit=10) == full
+        assert len(full) == len(tasks)
+
+    def test_warm_scheduling_reads_no_task_files(self, queue, monkeypatch):
+        queue.create_task(instructions="A", priority=1)
+        queue.create_task(instructions="B", priority=2)
+        queue.get_pending_headers()
+
+        loads = []
+        real = Task.from_file
+        monkeypatch.setattr(Task, "from_file", classmethod(lambda cls, p, *a: loads.append(p) or real(p, *a)))
+
+        assert [h.priority for h in queue.get_pending_headers()] == [2, 1]
+        assert loads == []
+
+    def test_pending_file_replaced_in_place_is_reread(self, queue):
+        task = queue.create_task(instructions="A", priority=1)
+        assert queue.get_pending_headers()[0].priority == 1
+
+        task.priority = 9
+        task.save(queue.root / "pending" / task.filename)
+        assert queue.get_pending_headers()[0].priority == 9
+        assert queue.get_pending_tasks()[0].priority == 9
+
+    def test_directory_named_like_a_task_is_ignored(self, queue):
+        queue.create_task(instructions="A")
+        (queue.root / "pending" / "task_dir.json").mkdir()
+        assert [t.instructions for t in queue.get_pending_tasks()] == ["A"]
+        assert len(queue.list_tasks()) == 1
+        assert queue.stats()["PENDING"] == 1
+
+    def test_claim_after_scan_reuses_the_parsed_task(self, queue, monkeypatch):
+        task = queue.create_task(instructions="A", target_files=["a.py"])
+        queue.get_pending_headers()
+
+        loads = []
+        real = Task.from_file
+        monkeypatch.setattr(Task, "from_file", classmethod(lambda cls, p, *a: loads.append(p) or real(p, *a)))
+        claimed = queue.claim_task(task.id)
+        assert loads == []
+        assert claimed.target_files == ["a.py"]
+        assert Task.from_file(queue.root / "running" / task.filename).status == TaskStatus.RUNNING
+
+    def test_claim_rereads_a_file_replaced_since_the_scan(self, queue):
+        task = queue.create_task(instructions="old")
+        queue.get_pending_headers()
+        task.instructions = "new"
+        task.save(queue.root / "pending" / task.filename)
+
+        assert queue.claim_task(task.id).instructions == "new"
+
+    def test_get_task_reuses_the_parse_until_the_file_changes(self, queue, monkeypatch):
+        task = queue.create_task(instructions="A")
+        assert queue.get_task(task.id).instructions == "A"
+
+        loads = []
+        real = Task.from_file
+        monkeypatch.setattr(Task, "from_file", classmethod(lambda cls, p, *a: loads.append(p) or real(p, *a)))
+        first = queue.get_task(task.id)
+        first.target_files.append("mutated.py")
+        assert queue.get_task(task.id).target_files == []
+        assert loads == []
+
+        task.instructions = "B"
+        task.save(queue.root / "pending" / task.filename)
+        assert queue.get_task(task.id).instructions == "B"
+        assert len(loads) == 1
+
+    def test_moves_drop_parse_cache_entries(self, queue):
+        for _ in range(3):
+            task = queue.create_task(instructions="A" * 1000)
+            queue.get_task(task.id)
+            queue.claim_task(task.id)
+            queue.get_task(task.id)
+            queue.complete_task(task.id, "done")
+        assert queue._parse_cache[TaskStatus.PENDING] == {}
+        assert queue._parse_cache[TaskStatus.RUNNING] == {}
+
+    def test_returned_tasks_are_independent(self, queue):
+        queue.create_task(instructions="A", target_files=["a.py"])
+        first = queue.get_pending_tasks()[0]
+        first.target_files.append("b.py")
+        assert queue.get_pending_tasks()[0].target_files == ["a.py"]
+
+    def test_list_tasks_reparses_only_changed_files(self, queue, monkeypatch):
+        a = queue.create_task(instructions="A")
+        queue.create_task(instructions="B")
+        queue.claim_task(a.id)
+        assert len(queue.list_tasks()) == 2
+
+        loads = []
+        real = Task.from_file
+        monkeypatch.setattr(Task, "from_file", classmethod(lambda cls, p, *a: loads.append(p) or real(p, *a)))
+
+        assert len(queue.list_tasks()) == 2
+        assert loads == []
+
+        queue.complete_task(a.id, "done")
+        done = queue.list_tasks(status=TaskStatus.COMPLETED)
+        assert [t.result for t in done] == ["done"]
+
+
+class TestMoveRace:
+    def test_lost_move_leaves_no_files_behind(self, queue, monkeypatch):
+        task = queue.create_task(instructions="Test")
+        queue.claim_task(task.id)
+        running_path = queue.root / "running" / task.filename
+        stale = (TaskStatus.RUNNING, str(running_path), running_path.stat())
+        # Another process finishes the task between lookup and rename
+        other = TaskQueue(queue.root)
+        other.fail_task(task.id, "elsewhere")
+        monkeypatch.setattr(queue, "_locate", lambda task_id: stale)
+
+        with pytest.raises(FileNotFoundError):
+            queue.complete_task(task.id, "done")
+
+        assert not running_path.exists()
+        assert list((queue.root / "completed").iterdir()) == []
+        assert (queue.root / "failed" / task.filename).exists()
+
+
+class TestMissingDirectories:
+    def test_transitions_recreate_removed_status_dirs(self, queue):
+        import shutil
+
+        task = queue.create_task(instructions="Test")
+        shutil.rmtree(queue.root / "running")
+        shutil.rmtree(queue.root / "completed")
+
+        queue.claim_task(task.id)
+        queue.complete_task(task.id, "done")
+        assert (queue.root / "completed" / task.filename).exists()
+
+    def test_save_creates_missing_parent(self, tmp_path):
+        path = tmp_path / "a" / "b" / "task.json"
+        Task(instructions="nested").save(path)
+        assert Task.from_file(path).instructions == "nested"
@@ -1,36 +1,104 @@
 """
 Run with: pytest -q tests/test_queue_concurrency.py::test_concurrent_claims
 
-This test creates a single pending task and launches two separate Python
-processes (via the helper script) that both attempt to claim the same task.
-Exactly one process must succeed and the other must report "ALREADY".
+This test creates a single pending task and launches two separate processes
+that both attempt to claim the same task. Exactly one process must succeed
+and the other must report "ALREADY".
+
+Where fork() is available the claimers are forked children, which inherit
+the already-imported agent_maestro instead of paying a full interpreter
+start-up each; elsewhere they run the helper script in fresh interpreters.
+Both ways are exercised wherever fork() exists.
 """
+import multiprocessing
+import os
 import sys
 import subprocess
 from pathlib import Path
 
+import pytest
+
+import agent_maestro
 from agent_maestro.queue import TaskQueue
 
 
-def test_concurrent_claims(tmp_path):
-    root = tmp_path / ".agent_bridge"
-    q = TaskQueue(root)
+def _claim_worker(root, task_id, conn):
+    """Forked-child counterpart of claim_worker.py: report through conn."""
+    try:
+        TaskQueue(root).claim_task(task_id)
+        conn.send("SUCCESS")
+        rc = 0
+    except ValueError as e:
+        # Expected path when another process already claimed the task
+        conn.send(f"ALREADY {e}")
+        rc = 2
+    except Exception as e:
+        conn.send(f"ERROR {e}")
+        rc = 3
+    conn.close()
+    sys.exit(rc)
+
+
+def _run_forked(root, task_id):
+    ctx = multiprocessing.get_context("fork")
+    procs = []
+    for _ in range(2):
+        recv, send = ctx.Pipe(duplex=False)
+        p = ctx.Process(target=_claim_worker, args=(root, task_id, send))
+        p.start()
+        send.close()
+        procs.append((p, recv))
+
+    runs = []
+    for p, recv in procs:
+        out = recv.recv() if recv.poll(10) else ""
+        p.join(10)
+        runs.append((out, "", p.exitcode))
+    return runs
 
-    # Create a single pending task
-    task = q.create_task("Perform concurrent claim test")
 
+def _run_subprocesses(root, task_id, out_dir):
     script = Path(__file__).parent / "claim_worker.py"
     assert script.exists(), f"helper script not found: {script}"
 
-    # Launch two independent Python processes that attempt to claim the task
-    p1 = subprocess.Popen([sys.executable, str(script), str(root), task.id], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    p2 = subprocess.Popen([sys.executable, str(script), str(root), task.id], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    # -S skips site.py (and its .pth scan); the queue needs only the stdlib,
+    # so point the children straight at the agent_maestro imported here
+    env = dict(os.environ, PYTHONPATH=str(Path(agent_maestro.__file__).parent.parent))
+    cmd = [sys.executable, "-S", str(script), str(root), task_id]
+
+    # Launch two independent Python processes that attempt to claim the task.
+    # Their few bytes of output go to files, read back after exit: no
+    # pipes to pump while waiting (communicate() uses threads on Windows).
+    procs = []
+    for n in (1, 2):
+        out, err = out_dir / f"out{n}", out_dir / f"err{n}"
+        with open(out, "wb") as out_f, open(err, "wb") as err_f:
+            procs.append((subprocess.Popen(cmd, stdout=out_f, stderr=err_f, env=env), out, err))
+
+    runs = []
+    for p, out, err in procs:
+        rc = p.wait(timeout=10)
+        runs.append((out.read_text(), err.read_text(), rc))
+    return runs
+
+
+@pytest.mark.parametrize("use_fork", [True, False], ids=["fork", "subprocess"])
+def test_concurrent_claims(tmp_path, use_fork):
+    if use_fork and "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("fork start method not available")
+    root = tmp_path / ".agent_bridge"
+    q = TaskQueue(root)
+
+    # Create a single pending task
+    task = q.create_task("Perform concurrent claim test")
 
-    out1, err1 = p1.communicate(timeout=10)
-    out2, err2 = p2.communicate(timeout=10)
+    if use_fork:
+        runs = _run_forked(root, task.id)
+    else:
+        runs = _run_subprocesses(root, task.id, tmp_path)
 
     results = []
-    for out, err, rc in ((out1, err1, p1.returncode), (out2, err2, p2.returncode)):
+    for out, err, rc in runs:
         out = (out or "").strip()
         err = (err or "").strip()
         if "SUCCESS" in out or rc == 0:
@@ -40,5 +108,5 @@ def test_concurrent_claims(tmp_path):
         else:
             results.append("error")
 
-    assert results.count("success") == 1, f"Expected exactly one success, got: {results} (stdout1={out1!r}, stderr1={err1!r}, stdout2={out2!r}, stderr2={err2!r})"
-    assert results.count("already") == 1, f"Expected one 'already' response, got: {results}"
\ No newline at end of file
+    assert results.count("success") == 1, f"Expected exactly one success, got: {results} (runs={runs!r})"
+    assert results.count("already") == 1, f"Expected one 'already' response, got: {results}"
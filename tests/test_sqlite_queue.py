@@ -0,0 +1,161 @@
+"""
+Tests for agent_maestro.sqlite_queue — SQLite-backed task queue.
+"""
+
+import threading
+
+import pytest
+
+from agent_maestro import _get_queue
+from agent_maestro.protocol import TaskStatus
+from agent_maestro.sqlite_queue import SQLiteTaskQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Create a SQLiteTaskQueue in a temporary directory."""
+    return SQLiteTaskQueue(tmp_path / ".agent_bridge")
+
+
+class TestSQLiteQueueOperations:
+    def test_create_and_get(self, queue):
+        task = queue.create_task(instructions="Test", agent_type="tester")
+        found = queue.get_task(task.id)
+        assert found is not None
+        assert found.status == TaskStatus.PENDING
+        assert found.agent_type == "tester"
+        assert (queue.root / "queue.db").exists()
+
+    def test_payload_roundtrips_non_ascii(self, queue):
+        task = queue.create_task(instructions="Résumé ✓", target_files=["données.py"], context='"q"\n')
+        found = queue.get_task(task.id)
+        assert found.to_dict() == task.to_dict()
+
+    def test_get_task_not_found(self, queue):
+        assert queue.get_task("nonexistent") is None
+
+    def test_lifecycle(self, queue):
+        task = queue.create_task(instructions="Test")
+        assert queue.claim_task(task.id).status == TaskStatus.RUNNING
+        done = queue.complete_task(task.id, "All done")
+        assert done.status == TaskStatus.COMPLETED
+        assert queue.get_task(task.id).result == "All done"
+
+    def test_fail_task(self, queue):
+        task = queue.create_task(instructions="Test")
+        queue.claim_task(task.id)
+        failed = queue.fail_task(task.id, "Timeout")
+        assert failed.status == TaskStatus.FAILED
+        assert queue.get_task(task.id).error == "Timeout"
+
+    def test_claim_non_pending_raises(self, queue):
+        task = queue.create_task(instructions="Test")
+        queue.claim_task(task.id)
+        with pytest.raises(ValueError, match="expected PENDING"):
+            queue.claim_task(task.id)
+
+    @pytest.mark.parametrize("single_statement", [True, False])
+    def test_claim_keeps_payload_in_step(self, queue, monkeypatch, single_statement):
+        import agent_maestro.sqlite_queue as sqlite_queue
+
+        monkeypatch.setattr(
+            sqlite_queue, "_SINGLE_STATEMENT_CLAIM",
+            single_statement and sqlite_queue._SINGLE_STATEMENT_CLAIM,
+        )
+        task = queue.create_task(instructions="Résumé", target_files=["a.py"], priority=2)
+        claimed = queue.claim_task(task.id)
+        assert claimed.status == TaskStatus.RUNNING
+        assert queue.get_task(task.id).to_dict() == claimed.to_dict()
+        assert {**task.to_dict(), "status": "RUNNING"} == claimed.to_dict()
+        with pytest.raises(ValueError, match="is RUNNING, expected PENDING"):
+            queue.claim_task(task.id)
+        with pytest.raises(ValueError, match="not found"):
+            queue.claim_task("nonexistent")
+
+    def test_complete_requires_running(self, queue):
+        task = queue.create_task(instructions="Test")
+        with pytest.raises(ValueError, match="expected RUNNING"):
+            queue.complete_task(task.id, "too early")
+
+    def test_create_tasks_is_all_or_nothing(self, queue, monkeypatch):
+        import sqlite3
+
+        tasks = queue.create_tasks([{"instructions": "A", "priority": 1}, {"instructions": "B"}])
+        assert [queue.get_task(t.id) for t in tasks] == tasks
+
+        # A failing row rolls back the rows inserted before it
+        real_payload = queue._payload
+
+        def payload(task):
+            if task.instructions == "D":
+                raise sqlite3.OperationalError("disk I/O error")
+            return real_payload(task)
+
+        monkeypatch.setattr(queue, "_payload", payload)
+        with pytest.raises(sqlite3.OperationalError):
+            queue.create_tasks([{"instructions": "C"}, {"instructions": "D"}])
+        assert sorted(t.instructions for t in queue.list_tasks()) == ["A", "B"]
+
+    def test_id_clash_is_rerolled(self, queue, record_os):
+        import os
+
+        import agent_maestro.protocol as protocol
+
+        # The first four ids drawn are the same: both create paths clash
+        clashing = iter([b"\x07" * 4] * 4)
+        record_os(protocol, urandom=lambda n: next(clashing, None) or os.urandom(n))
+
+        first = queue.create_task(instructions="A")
+        second = queue.create_task(instructions="B")
+        batch = queue.create_tasks([{"instructions": "C"}, {"instructions": "D"}])
+        assert first.id == "07070707"
+        assert len({first.id, second.id, *(t.id for t in batch)}) == 4
+        assert [queue.get_task(t.id).instructions for t in (first, second, *batch)] == ["A", "B", "C", "D"]
+
+    def test_concurrent_claim_single_winner(self, queue):
+        task = queue.create_task(instructions="race")
+        results = []
+
+        def claim():
+            try:
+                queue.claim_task(task.id)
+                results.append("ok")
+            except ValueError:
+                results.append("already")
+
+        threads = [threading.Thread(target=claim) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results.count("ok") == 1
+
+
+class TestSQLiteQueueQueries:
+    def test_priority_ordering(self, queue):
+        queue.create_task(instructions="Low priority", priority=0)
+        queue.create_task(instructions="High priority", priority=10)
+        queue.create_task(instructions="Medium priority", priority=5)
+
+        pending = queue.get_pending_tasks()
+        assert [t.priority for t in pending] == [10, 5, 0]
+        assert [h.id for h in queue.get_pending_headers()] == [t.id for t in pending]
+        assert [h.id for h in queue.get_pending_headers(limit=2)] == [t.id for t in pending[:2]]
+        assert [t.id for t in queue.get_pending_tasks(limit=2)] == [t.id for t in pending[:2]]
+
+    def test_stats_and_clear(self, queue):
+        queue.create_task(instructions="P1")
+        t = queue.create_task(instructions="R1")
+        queue.claim_task(t.id)
+        queue.complete_task(t.id, "Done")
+
+        assert queue.stats() == {"PENDING": 1, "RUNNING": 0, "COMPLETED": 1, "FAILED": 0}
+        assert queue.clear_completed() == 1
+        assert queue.stats()["COMPLETED"] == 0
+        queue.flush()
+        assert queue.stats()["PENDING"] == 1
+
+
+def test_backend_selected_from_config(tmp_path):
+    (tmp_path / "config.yaml").write_text("bridge:\n  backend: sqlite\n", encoding="utf-8")
+    assert isinstance(_get_queue(tmp_path), SQLiteTaskQueue)
@@ -0,0 +1,277 @@
+"""
+Tests for agent_maestro.watcher — wake-up behaviour of the poll loop.
+"""
+
+import sys
+import threading
+import time
+
+import pytest
+
+from agent_maestro.protocol import TaskStatus
+from agent_maestro.queue import TaskQueue
+from agent_maestro.watcher import BridgeWatcher, _DirNotifier
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_notifier_wakes_on_new_file(tmp_path):
+    notifier = _DirNotifier(tmp_path)
+    assert notifier.active
+    try:
+        timer = threading.Timer(0.1, (tmp_path / "task_x.json").write_text, args=("{}",))
+        timer.start()
+        start = time.monotonic()
+        notifier.wait(timeout=5.0)
+        assert time.monotonic() - start < 2.0
+        timer.join()
+    finally:
+        notifier.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_task_file_written_in_steps_is_not_picked_up_half_done(tmp_path):
+    from agent_maestro.protocol import RunResult, Task
+    from agent_maestro.runners.base import BaseRunner
+
+    class DoneRunner(BaseRunner):
+        def execute(self, task, project_root):
+            return RunResult(success=True, output="done")
+
+    queue = TaskQueue(tmp_path / ".agent_bridge")
+    watcher = BridgeWatcher(queue, tmp_path, runner=DoneRunner(), poll_interval=60)
+    thread = threading.Thread(target=watcher.start, daemon=True)
+    thread.start()
+    try:
+        for _ in range(50):
+            if watcher._notifier is not None:
+                break
+            time.sleep(0.02)
+        time.sleep(0.1)  # let the loop settle into its wait
+
+        # Written in place, as an orchestrator following AGENTS.md would
+        task = Task(instructions="Written in two steps")
+        data = task.to_bytes()
+        with open(queue.root / "pending" / task.filename, "wb") as f:
+            f.write(data[:10])
+            f.flush()
+            time.sleep(0.2)
+            f.write(data[10:])
+
+        done = queue.root / "completed" / task.filename
+        for _ in range(100):
+            if done.exists():
+                break
+            time.sleep(0.02)
+        assert queue.get_task(task.id).status == TaskStatus.COMPLETED
+        assert not list((queue.root / "failed").iterdir())
+    finally:
+        watcher.stop()
+        thread.join(timeout=5)
+
+
+def test_notifier_times_out_when_idle(tmp_path):
+    notifier = _DirNotifier(tmp_path)
+    try:
+        start = time.monotonic()
+        notifier.wait(timeout=0.1)
+        assert time.monotonic() - start >= 0.09
+    finally:
+        notifier.close()
+
+
+@pytest.mark.parametrize("watched", [True, False])
+def test_wake_ends_wait_immediately(tmp_path, watched):
+    notifier = _DirNotifier(tmp_path if watched else None)
+    try:
+        timer = threading.Timer(0.1, notifier.wake)
+        timer.start()
+        start = time.monotonic()
+        notifier.wait(timeout=5.0)
+        assert time.monotonic() - start < 2.0
+        timer.join()
+        # The wake-up is consumed: the next wait runs its full timeout
+        start = time.monotonic()
+        notifier.wait(timeout=0.1)
+        assert time.monotonic() - start >= 0.09
+    finally:
+        notifier.close()
+
+
+def test_stop_interrupts_a_long_poll_interval(tmp_path):
+    watcher = BridgeWatcher(TaskQueue(tmp_path / ".agent_bridge"), tmp_path, poll_interval=60)
+    thread = threading.Thread(target=watcher.start, daemon=True)
+    thread.start()
+    for _ in range(50):
+        if watcher._notifier is not None:
+            break
+        time.sleep(0.02)
+    time.sleep(0.1)  # let the loop settle into its wait
+
+    start = time.monotonic()
+    watcher.stop()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert time.monotonic() - start < 2.0
+
+
+class _InlineExecutor:
+    """Records submissions without running them."""
+
+    def __init__(self):
+        self.submitted = []
+        self.futures = []
+
+    def submit(self, fn, task):
+        from concurrent.futures import Future
+
+        self.submitted.append(task.id)
+        self.futures.append(Future())
+        return self.futures[-1]
+
+
+def test_poll_cycle_lists_pending_once_per_cycle(tmp_path, monkeypatch):
+    queue = TaskQueue(tmp_path / ".agent_bridge")
+    tasks = [queue.create_task(instructions=f"T{i}", priority=i) for i in range(4)]
+    listings = []
+    real = queue.get_pending_headers
+    monkeypatch.setattr(queue, "get_pending_headers", lambda **kw: listings.append(kw) or real(**kw))
+
+    watcher = BridgeWatcher(queue, tmp_path, max_workers=3)
+    executor = _InlineExecutor()
+    watcher._poll_cycle(executor)
+
+    assert listings == [{"limit": 3}]
+    assert executor.submitted == [t.id for t in reversed(tasks)][:3]
+    assert [h.id for h in real()] == [tasks[0].id]
+
+
+def test_finished_task_frees_its_slot_without_a_sweep(tmp_path):
+    queue = TaskQueue(tmp_path / ".agent_bridge")
+    first = queue.create_task(instructions="A", priority=1)
+    second = queue.create_task(instructions="B")
+    watcher = BridgeWatcher(queue, tmp_path, max_workers=1)
+    executor = _InlineExecutor()
+
+    watcher._poll_cycle(executor)
+    watcher._poll_cycle(executor)
+    assert executor.submitted == [first.id]
+
+    executor.futures[0].set_result(None)
+    assert watcher._active_tasks == {}
+    watcher._poll_cycle(executor)
+    assert executor.submitted == [first.id, second.id]
+
+
+def test_poll_cycle_never_claims_ahead_of_free_workers(tmp_path):
+    queue = TaskQueue(tmp_path / ".agent_bridge")
+    for i in range(5):
+        queue.create_task(instructions=f"T{i}")
+    watcher = BridgeWatcher(queue, tmp_path, max_workers=2)
+
+    watcher._poll_cycle(_InlineExecutor())
+    stats = queue.stats()
+    assert stats["RUNNING"] == 2
+    assert stats["PENDING"] == 3
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_wakeup_costs_one_read(tmp_path, record_os):
+    import agent_maestro.watcher as watcher_mod
+
+    notifier = _DirNotifier(tmp_path)
+    try:
+        for _ in range(3):
+            notifier.wake()
+        recorder = record_os(watcher_mod)
+        notifier.wait(timeout=5.0)
+        assert recorder.calls == ["read"]
+    finally:
+        notifier.close()
+
+
+def test_log_writes_each_line_in_one_call(monkeypatch):
+    import io
+
+    from agent_maestro import watcher as watcher_mod
+
+    out = io.StringIO()
+    writes = []
+    monkeypatch.setattr(watcher_mod.sys, "stdout", out)
+    monkeypatch.setattr(out, "write", lambda s: writes.append(s) or io.StringIO.write(out, s))
+    watcher_mod._log("✅", "first")
+    watcher_mod._log("✅", "second")
+    assert len(writes) == 2
+    assert all(w.endswith("\n") for w in writes)
+    assert "first" in writes[0] and "second" in writes[1]
+
+
+def test_poll_cycle_skips_tasks_it_already_dispatched(tmp_path, monkeypatch):
+    from agent_maestro.protocol import TaskHeader
+
+    queue = TaskQueue(tmp_path / ".agent_bridge")
+    task = queue.create_task(instructions="A")
+    stale = [TaskHeader(task.id, task.priority, task.created_at)]
+    watcher = BridgeWatcher(queue, tmp_path, max_workers=2)
+    executor = _InlineExecutor()
+    watcher._poll_cycle(executor)
+
+    # A listing that still shows the task (e.g. taken before the claim)
+    monkeypatch.setattr(queue, "get_pending_headers", lambda **kw: stale)
+    claims = []
+    monkeypatch.setattr(queue, "claim_task", lambda tid: claims.append(tid))
+    watcher._poll_cycle(executor)
+    assert claims == []
+    assert executor.submitted == [task.id]
+
+
+def test_saturated_poll_cycle_does_no_io(tmp_path, monkeypatch):
+    queue = TaskQueue(tmp_path / ".agent_bridge")
+    queue.create_task(instructions="A")
+    queue.create_task(instructions="B")
+    watcher = BridgeWatcher(queue, tmp_path, max_workers=1)
+    executor = _InlineExecutor()
+    watcher._poll_cycle(executor)
+
+    def no_io(*args, **kwargs):
+        raise AssertionError("a saturated watcher must not touch the queue")
+
+    monkeypatch.setattr(queue, "get_pending_headers", no_io)
+    monkeypatch.setattr(queue, "claim_task", no_io)
+    watcher._poll_cycle(executor)
+    assert len(executor.submitted) == 1
+
+
+def test_empty_queue_costs_one_listing(tmp_path, monkeypatch):
+    queue = TaskQueue(tmp_path / ".agent_bridge")
+    listings = []
+    real = queue.get_pending_headers
+    monkeypatch.setattr(queue, "get_pending_headers", lambda **kw: listings.append(kw) or real(**kw))
+
+    executor = _InlineExecutor()
+    BridgeWatcher(queue, tmp_path, max_workers=4)._poll_cycle(executor)
+    assert len(listings) == 1
+    assert executor.submitted == []
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs POSIX signal delivery")
+@pytest.mark.parametrize("inotify", [True, False])
+def test_sigint_stops_a_long_poll_interval_promptly(tmp_path, monkeypatch, inotify):
+    import os
+    import signal
+
+    if not inotify:
+        import agent_maestro.watcher as watcher_mod
+
+        monkeypatch.setattr(watcher_mod, "_IS_LINUX", False)
+    saved = signal.getsignal(signal.SIGINT), signal.getsignal(signal.SIGTERM)
+    watcher = BridgeWatcher(TaskQueue(tmp_path / ".agent_bridge"), tmp_path, poll_interval=60)
+    timer = threading.Timer(0.2, os.kill, args=(os.getpid(), signal.SIGINT))
+    try:
+        timer.start()
+        start = time.monotonic()
+        watcher.start()  # main thread, so start() installs its handlers
+        assert time.monotonic() - start < 2.0
+    finally:
+        timer.cancel()
+        signal.signal(signal.SIGINT, saved[0])
+        signal.signal(signal.SIGTERM, saved[1])